@@ -0,0 +1,331 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+from config import settings
+from utils.metrics import BROWSER_LAUNCHES
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def normalize_cookies(cookies: list[dict]) -> list[dict]:
+    """Normalize cookies for Playwright compatibility."""
+    # Valid sameSite values for Playwright
+    valid_same_site = {"Strict", "Lax", "None"}
+    same_site_map = {
+        "strict": "Strict",
+        "lax": "Lax",
+        "none": "None",
+        "no_restriction": "None",
+        "unspecified": "Lax",
+    }
+
+    normalized = []
+    for cookie in cookies:
+        c = cookie.copy()
+
+        # Normalize sameSite value
+        if "sameSite" in c:
+            same_site = c["sameSite"]
+            if same_site not in valid_same_site:
+                # Try to map common variations
+                c["sameSite"] = same_site_map.get(
+                    str(same_site).lower(), "Lax"
+                )
+
+        # Remove fields that Playwright doesn't accept
+        c.pop("hostOnly", None)
+        c.pop("session", None)
+        c.pop("storeId", None)
+        c.pop("id", None)
+
+        normalized.append(c)
+
+    return normalized
+
+
+def load_x_cookies() -> list[dict] | None:
+    """Load X.com auth cookies from the environment or the cookies file."""
+    cookies = None
+
+    # Try environment variable first (for Heroku)
+    if settings.x_cookies_json:
+        try:
+            cookies = json.loads(settings.x_cookies_json)
+            logger.info("Loaded X.com cookies from environment variable")
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON in X_COOKIES_JSON environment variable")
+
+    # Fall back to file (for local development)
+    if not cookies:
+        try:
+            with open(settings.x_cookies_path, "r") as f:
+                cookies = json.load(f)
+                logger.info("Loaded X.com cookies from %s", settings.x_cookies_path)
+        except FileNotFoundError:
+            logger.warning(
+                "No X.com cookies found at %s — will browse as logged out",
+                settings.x_cookies_path,
+            )
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON in X.com cookies file")
+
+    return normalize_cookies(cookies) if cookies else None
+
+
+class _Slot:
+    """A warm browser context with a single page, owned by the pool."""
+
+    def __init__(self, context: BrowserContext, page: Page):
+        self.context = context
+        self.page = page
+        self.last_used = time.monotonic()
+        self.crashed = False
+        page.on("crash", self._on_crash)
+
+    def _on_crash(self, *_):
+        self.crashed = True
+
+    @property
+    def healthy(self) -> bool:
+        return not self.crashed and not self.page.is_closed()
+
+    async def close(self):
+        try:
+            await self.context.close()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """Process-wide pool of warm Playwright contexts for X.com scraping.
+
+    A single Chromium instance is launched once and shared. Each slot is a
+    browser context with cookies already applied and one open page. Pages
+    are checked out per search and returned afterwards; crashed pages are
+    replaced and slots idle for longer than ``idle_timeout`` are closed.
+    """
+
+    def __init__(self, size: int | None = None, idle_timeout: float | None = None):
+        self.size = max(1, size or settings.browser_pool_size)
+        self.idle_timeout = (
+            idle_timeout if idle_timeout is not None else settings.browser_pool_idle_seconds
+        )
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._cookies: list[dict] | None = None
+        self._cookies_loaded = False
+        self._idle: list[_Slot] = []
+        self._in_use = 0
+        self._semaphore = asyncio.Semaphore(self.size)
+        self._lock = asyncio.Lock()
+        self._evictor: asyncio.Task | None = None
+        self._closed = False
+
+        # Metrics
+        self._browser_launches = 0
+        self._contexts_created = 0
+        self._contexts_evicted = 0
+        self._contexts_restarted = 0
+        self._checkouts = 0
+        self._wait_seconds_total = 0.0
+
+    async def start(self, warm: bool = True):
+        """Launch Chromium and optionally pre-create all contexts."""
+        await self._ensure_browser()
+        if warm:
+            for _ in range(self.size):
+                self._idle.append(await self._new_slot())
+        if self.idle_timeout > 0:
+            self._evictor = asyncio.create_task(self._evict_idle_loop())
+        logger.info("Browser pool started with %d context(s)", len(self._idle))
+
+    async def close(self):
+        """Close every context, the browser and Playwright."""
+        self._closed = True
+        if self._evictor:
+            self._evictor.cancel()
+            self._evictor = None
+        for slot in self._idle:
+            await slot.close()
+        self._idle.clear()
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _ensure_browser(self):
+        """Launch Chromium if it is not running (or has disconnected)."""
+        if self._browser is not None and self._browser.is_connected():
+            return
+
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+
+            if self._browser is not None:
+                logger.warning("Chromium disconnected — relaunching")
+                # Contexts belonged to the dead browser
+                self._idle.clear()
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            # Heroku-compatible Playwright configuration
+            launch_options = {
+                "headless": True,
+                "args": [
+                    "--no-sandbox",
+                    "--disable-setuid-sandbox",
+                    "--disable-dev-shm-usage",
+                ]
+            }
+
+            # Use Heroku buildpack executable path if available
+            chromium_path = os.getenv("CHROMIUM_EXECUTABLE_PATH")
+            if chromium_path:
+                launch_options["executable_path"] = chromium_path
+                logger.info("Using Chromium from Heroku buildpack: %s", chromium_path)
+
+            self._browser = await self._playwright.chromium.launch(**launch_options)
+            self._browser_launches += 1
+            BROWSER_LAUNCHES.inc()
+
+    async def _new_slot(self) -> _Slot:
+        """Create a new context with cookies applied and one open page."""
+        await self._ensure_browser()
+        assert self._browser is not None
+
+        if not self._cookies_loaded:
+            self._cookies = load_x_cookies()
+            self._cookies_loaded = True
+
+        context = await self._browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={"width": 1280, "height": 900},
+        )
+        if self._cookies:
+            await context.add_cookies(self._cookies)
+        page = await context.new_page()
+        self._contexts_created += 1
+        return _Slot(context, page)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Check out a warm page for the duration of the ``async with`` block."""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        started = time.monotonic()
+        async with self._semaphore:
+            self._wait_seconds_total += time.monotonic() - started
+            self._checkouts += 1
+            slot = await self._checkout()
+            self._in_use += 1
+            try:
+                yield slot.page
+            finally:
+                self._in_use -= 1
+                await self._checkin(slot)
+
+    async def _checkout(self) -> _Slot:
+        await self._ensure_browser()
+        while self._idle:
+            # Most recently used first, so rarely used slots age out
+            slot = self._idle.pop()
+            if slot.healthy:
+                return slot
+            self._contexts_restarted += 1
+            await slot.close()
+        return await self._new_slot()
+
+    async def _checkin(self, slot: _Slot):
+        if self._closed:
+            await slot.close()
+            return
+        if not slot.healthy or self._browser is None or not self._browser.is_connected():
+            logger.warning("Discarding crashed browser context")
+            self._contexts_restarted += 1
+            await slot.close()
+            return
+        slot.last_used = time.monotonic()
+        self._idle.append(slot)
+
+    async def _evict_idle_loop(self):
+        interval = max(1.0, self.idle_timeout / 2)
+        while True:
+            await asyncio.sleep(interval)
+            cutoff = time.monotonic() - self.idle_timeout
+            stale = [s for s in self._idle if s.last_used < cutoff]
+            if not stale:
+                continue
+            self._idle = [s for s in self._idle if s.last_used >= cutoff]
+            for slot in stale:
+                await slot.close()
+            self._contexts_evicted += len(stale)
+            logger.info("Evicted %d idle browser context(s)", len(stale))
+
+    def stats(self) -> dict:
+        """Pool metrics for the health endpoint."""
+        return {
+            "size": self.size,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "browser_connected": bool(self._browser and self._browser.is_connected()),
+            "browser_launches": self._browser_launches,
+            "contexts_created": self._contexts_created,
+            "contexts_evicted": self._contexts_evicted,
+            "contexts_restarted": self._contexts_restarted,
+            "checkouts": self._checkouts,
+            "avg_wait_ms": round(
+                1000 * self._wait_seconds_total / self._checkouts, 1
+            ) if self._checkouts else 0.0,
+        }
+
+
+_pool: BrowserPool | None = None
+
+
+async def init_browser_pool() -> BrowserPool | None:
+    """Start the shared browser pool. Returns None if Chromium is unavailable."""
+    global _pool
+    pool = BrowserPool()
+    try:
+        await pool.start()
+        _pool = pool
+        return _pool
+    except Exception as e:
+        logger.warning("Browser pool unavailable (%s) — X.com will launch per request", e)
+        await pool.close()
+        _pool = None
+        return None
+
+
+async def close_browser_pool():
+    """Close the shared browser pool."""
+    global _pool
+    if _pool:
+        await _pool.close()
+        _pool = None
+
+
+def get_browser_pool() -> BrowserPool | None:
+    """Get the shared browser pool. Returns None if not started."""
+    return _pool
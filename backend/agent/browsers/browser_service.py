@@ -0,0 +1,85 @@
+"""Browser service: runs X.com searches on behalf of the API workers.
+
+Chromium is by far the largest part of the backend's footprint, so it lives
+in one process of its own. API workers started with ``X_BROWSER_SERVICE_URL``
+pointing here launch no browser; ``XBrowser.search`` posts the topic to
+``/search`` and gets the items back. The workers stay stateless and can be
+scaled across cores independently of the browser pool.
+
+Run from the backend directory:
+
+    python -m agent.browsers.browser_service --port 8001
+"""
+
+import argparse
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from agent.browsers.browser_pool import init_browser_pool, close_browser_pool, get_browser_pool
+from agent.browsers.x_browser import XBrowser
+from routers import metrics
+from utils.circuit_breaker import breaker_stats
+from utils.json_response import ORJSONResponse
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+
+_browser = XBrowser()
+
+
+class SearchRequest(BaseModel):
+    topic: str
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_browser_pool()
+    yield
+    await _browser.close()
+    await close_browser_pool()
+
+
+app = FastAPI(
+    title="Interactive Radio browser service",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.include_router(metrics.router)
+
+
+@app.post("/search")
+async def search(request: SearchRequest):
+    """Search X.com in this process's browser pool."""
+    items = await _browser.search_local(request.topic)
+    return {"items": [item.model_dump(mode="json") for item in items]}
+
+
+@app.get("/health")
+async def health():
+    pool = get_browser_pool()
+    return {
+        "status": "ok",
+        "browser_pool": pool.stats() if pool else None,
+        "circuits": breaker_stats(),
+    }
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    # One process on purpose: it owns the browser pool
+    uvicorn.run(app, host=args.host, port=args.port, workers=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,176 +1,351 @@
-import json
+import asyncio
 import logging
-import os
+import time
 from datetime import datetime, timedelta, timezone
 from urllib.parse import quote
 
-from playwright.async_api import async_playwright, Browser, Page
-
+import httpx
+from playwright.async_api import Page, Response
+from pydantic import ValidationError
+
+from agent.browsers.browser_pool import BrowserPool, get_browser_pool
+from agent.browsers.x_graphql import (
+    count_timeline_tweets,
+    is_search_timeline,
+    parse_search_timeline,
+)
+from agent.fetchers.http_client import http_client
 from config import settings
 from models.feed_item import FeedItem, NewsSource
+from utils.circuit_breaker import AdaptiveTimeout, get_breaker
+from utils.metrics import FETCH_SECONDS, X_STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Timeouts adapted to the observed p95 of each stage, capped at the
+# previous fixed values
+_navigate_timeout = AdaptiveTimeout(default=15.0, floor=3.0)
+_timeline_timeout = AdaptiveTimeout(default=10.0, floor=2.0)
+_tweets_timeout = AdaptiveTimeout(default=10.0, floor=2.0)
+
+# Incremental DOM scraping: stop after this many scrolls or this long, and
+# consider the results exhausted after two scrolls that load no new tweets
+MAX_SCROLLS = 8
+SCROLL_IDLE_MS = 1500
+SCROLL_BUDGET_SECONDS = 6.0
+
+# Collects tweets as they render while scrolling the results, in one
+# round-trip. A MutationObserver picks up new tweets, which are deduplicated
+# by status id; promoted tweets (no timestamp) are skipped. The DOM itself
+# belongs to X's React app and is left to its list virtualization, but each
+# processed tweet's images and videos are released so decoded media does
+# not pile up while scrolling. Scrolling stops at ``limit`` tweets,
+# at the first tweet older than ``cutoff`` (live results are newest first),
+# when scrolls stop loading tweets, or after ``budgetMs``. Returns, per
+# tweet, the raw strings the Python side needs to build a FeedItem.
+_SCROLL_TWEETS_JS = r"""
+async ({limit, cutoff, maxScrolls, idleMs, budgetMs}) => {
+  const started = Date.now();
+  const seen = new Set();
+  const tweets = [];
+  let reachedCutoff = false;
+  let wake = null;
+
+  const read = (tweet) => {
+    const textEl = tweet.querySelector('[data-testid="tweetText"]');
+
+    let author = null;
+    for (const link of tweet.querySelectorAll('a[role="link"]')) {
+      const href = link.getAttribute('href');
+      if (href && href.startsWith('/') && !href.startsWith('/search')) {
+        author = href.replace(/^\/+|\/+$/g, '');
+        break;
+      }
+    }
+
+    let url = null;
+    for (const link of tweet.querySelectorAll('a[href*="/status/"]')) {
+      const href = link.getAttribute('href');
+      if (href && href.includes('/status/')) {
+        url = href;
+        break;
+      }
+    }
+
+    const time = tweet.querySelector('time');
+
+    return {
+      text: textEl ? textEl.innerText : null,
+      author,
+      datetime: time ? time.getAttribute('datetime') : null,
+      url,
+      engagement: ['like', 'retweet', 'reply'].map((testId) => {
+        const btn = tweet.querySelector(`[data-testid="${testId}"]`);
+        return btn ? btn.getAttribute('aria-label') : null;
+      }),
+    };
+  };
+
+  // Attribute changes only: React keeps ownership of every node
+  const release = (tweet) => {
+    for (const img of tweet.querySelectorAll('img')) {
+      img.removeAttribute('srcset');
+      img.setAttribute('src', 'data:,');
+    }
+    for (const video of tweet.querySelectorAll('video')) {
+      video.pause();
+      video.removeAttribute('src');
+      video.removeAttribute('poster');
+      for (const source of video.querySelectorAll('source')) source.removeAttribute('src');
+      video.load();
+    }
+  };
+
+  const take = (tweet) => {
+    if (tweet.hasAttribute('data-radio-seen')) return;
+    tweet.setAttribute('data-radio-seen', '');
+
+    const raw = read(tweet);
+    const id = raw.url ? (raw.url.match(/\/status\/(\d+)/) || [])[1] : null;
+    if (id && raw.datetime && !seen.has(id)) {
+      seen.add(id);
+      if (Date.parse(raw.datetime) < cutoff) {
+        reachedCutoff = true;
+      } else if (tweets.length < limit) {
+        tweets.push(raw);
+      }
+    }
+
+    release(tweet);
+  };
+
+  const scan = (root) => {
+    if (root.matches('[data-testid="tweet"]')) take(root);
+    root.querySelectorAll('[data-testid="tweet"]').forEach(take);
+  };
+
+  const observer = new MutationObserver((mutations) => {
+    const before = seen.size;
+    for (const mutation of mutations) {
+      for (const node of mutation.addedNodes) {
+        if (node.nodeType === Node.ELEMENT_NODE) scan(node);
+      }
+    }
+    if (seen.size > before && wake) wake();
+  });
+  observer.observe(document.body, {childList: true, subtree: true});
+
+  try {
+    scan(document.body);
+    let scrolls = 0;
+    let idle = 0;
+    while (
+      tweets.length < limit && !reachedCutoff && idle < 2
+      && scrolls < maxScrolls && Date.now() - started < budgetMs
+    ) {
+      const before = seen.size;
+      window.scrollBy(0, window.innerHeight * 2);
+      scrolls += 1;
+      await new Promise((resolve) => {
+        wake = resolve;
+        setTimeout(resolve, idleMs);
+      });
+      wake = null;
+      idle = seen.size > before ? 0 : idle + 1;
+    }
+  } finally {
+    observer.disconnect();
+  }
+
+  return {tweets, reachedCutoff};
+}
+"""
+
 
 class XBrowser:
     """Browse and search X.com for posts using Playwright headless browser."""
 
     def __init__(self):
-        self._browser: Browser | None = None
-        self._page: Page | None = None
+        self._own_pool: BrowserPool | None = None
 
     def _is_within_age_limit(self, published: datetime) -> bool:
         """Check if the published date is within the configured age limit."""
         cutoff = datetime.now(timezone.utc) - timedelta(days=settings.max_feed_age_days)
         return published >= cutoff
 
-    def _normalize_cookies(self, cookies: list[dict]) -> list[dict]:
-        """Normalize cookies for Playwright compatibility."""
-        # Valid sameSite values for Playwright
-        valid_same_site = {"Strict", "Lax", "None"}
-        same_site_map = {
-            "strict": "Strict",
-            "lax": "Lax",
-            "none": "None",
-            "no_restriction": "None",
-            "unspecified": "Lax",
-        }
-
-        normalized = []
-        for cookie in cookies:
-            c = cookie.copy()
-            
-            # Normalize sameSite value
-            if "sameSite" in c:
-                same_site = c["sameSite"]
-                if same_site not in valid_same_site:
-                    # Try to map common variations
-                    c["sameSite"] = same_site_map.get(
-                        str(same_site).lower(), "Lax"
-                    )
-            
-            # Remove fields that Playwright doesn't accept
-            c.pop("hostOnly", None)
-            c.pop("session", None)
-            c.pop("storeId", None)
-            c.pop("id", None)
-            
-            normalized.append(c)
-        
-        return normalized
-
-    async def _ensure_browser(self):
-        """Launch browser and load cookies if not already running."""
-        if self._browser is not None and self._page is not None:
-            return
-
-        pw = await async_playwright().start()
-        
-        # Heroku-compatible Playwright configuration
-        launch_options = {
-            "headless": True,
-            "args": [
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-            ]
-        }
-        
-        # Use Heroku buildpack executable path if available
-        chromium_path = os.getenv("CHROMIUM_EXECUTABLE_PATH")
-        if chromium_path:
-            launch_options["executable_path"] = chromium_path
-            logger.info("Using Chromium from Heroku buildpack: %s", chromium_path)
-        
-        self._browser = await pw.chromium.launch(**launch_options)
-
-        context = await self._browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1280, "height": 900},
-        )
+    def _get_pool(self) -> BrowserPool:
+        """Use the shared pool, or a private single-context pool if none is running."""
+        pool = get_browser_pool()
+        if pool is not None:
+            return pool
+        if self._own_pool is None:
+            self._own_pool = BrowserPool(size=1, idle_timeout=0)
+        return self._own_pool
 
-        # Load auth cookies if available
-        cookies = None
-        
-        # Try environment variable first (for Heroku)
-        if settings.x_cookies_json:
-            try:
-                cookies = json.loads(settings.x_cookies_json)
-                logger.info("Loaded X.com cookies from environment variable")
-            except json.JSONDecodeError:
-                logger.error("Invalid JSON in X_COOKIES_JSON environment variable")
-        
-        # Fall back to file (for local development)
-        if not cookies:
-            try:
-                with open(settings.x_cookies_path, "r") as f:
-                    cookies = json.load(f)
-                    logger.info("Loaded X.com cookies from %s", settings.x_cookies_path)
-            except FileNotFoundError:
-                logger.warning(
-                    "No X.com cookies found at %s — will browse as logged out",
-                    settings.x_cookies_path,
+    async def search(self, topic: str) -> list[FeedItem]:
+        """Search X.com for posts matching a topic.
+
+        Runs in the browser service when ``x_browser_service_url`` is set,
+        otherwise in this process.
+        """
+        if settings.x_browser_service_url:
+            return await self._search_remote(topic)
+        return await self.search_local(topic)
+
+    @FETCH_SECONDS.time(source="twitter")
+    async def _search_remote(self, topic: str) -> list[FeedItem]:
+        """Have the browser service run the search."""
+        try:
+            async with http_client() as client:
+                response = await client.post(
+                    f"{settings.x_browser_service_url}/search",
+                    json={"topic": topic},
+                    timeout=settings.collect_deadline_seconds,
                 )
-            except json.JSONDecodeError:
-                logger.error("Invalid JSON in X.com cookies file")
-        
-        # Add cookies to context if loaded
-        if cookies:
-            normalized_cookies = self._normalize_cookies(cookies)
-            await context.add_cookies(normalized_cookies)
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error("Browser service search failed for '%s': %s", topic, e)
+            return []
+        try:
+            return [FeedItem.model_validate(item) for item in response.json()["items"]]
+        except (KeyError, TypeError, ValueError, ValidationError) as e:
+            logger.error("Browser service sent a malformed reply for '%s': %s", topic, e)
+            return []
 
-        self._page = await context.new_page()
+    @FETCH_SECONDS.time(source="twitter")
+    async def search_local(self, topic: str) -> list[FeedItem]:
+        """Search X.com with a browser in this process.
+
+        Searches whose results page does not load (navigation error, logged
+        out, layout changed, timed out) count as failures for X's circuit
+        breaker; a loaded page with no results counts as a success. While
+        the breaker is open, searches return nothing immediately.
+        """
+        breaker = get_breaker("twitter")
+        if not breaker.allow():
+            logger.info("X.com circuit open — skipping search for '%s'", topic)
+            return []
 
-    async def search(self, topic: str) -> list[FeedItem]:
-        """Search X.com for posts matching a topic."""
         try:
-            await self._ensure_browser()
-            assert self._page is not None
+            posts = await self._search(topic)
+        except Exception as e:
+            breaker.record_failure()
+            logger.error("X.com search failed for '%s': %s", topic, e)
+            return []
 
+        breaker.record_success()
+        return posts[: settings.max_items_per_source]
+
+    async def _search(self, topic: str) -> list[FeedItem]:
+        """Load the search page and read its posts.
+
+        Raises if neither posts nor X's "no results" state load.
+        """
+        async with self._get_pool().page() as page:
             search_url = (
-                f"https://x.com/search?q={quote(topic)}&src=typed_query&f=live"
-            )
-            await self._page.goto(
-                search_url, wait_until="domcontentloaded", timeout=15000
+                f"{settings.x_base_url}/search?q={quote(topic)}&src=typed_query&f=live"
             )
 
-            # Wait for tweets to load
+            if settings.x_capture_mode == "graphql":
+                payload = await self._goto_capturing_timeline(page, search_url)
+                if payload is None:
+                    logger.info("No SearchTimeline payload for '%s' — scraping DOM", topic)
+                else:
+                    parsed = parse_search_timeline(payload)
+                    if parsed or not count_timeline_tweets(payload):
+                        return [
+                            item for item in parsed
+                            if self._is_within_age_limit(item.published_at)
+                        ]
+                    logger.warning(
+                        "SearchTimeline for '%s' had %d tweet(s) but none parsed — "
+                        "scraping DOM", topic, count_timeline_tweets(payload),
+                    )
+            else:
+                await self._goto(page, search_url)
+
+            # Wait for tweets, or the empty state X shows when there are none
             try:
-                await self._page.wait_for_selector(
-                    '[data-testid="tweet"]', timeout=10000
-                )
-            except Exception:
-                logger.warning("No tweets found for topic: %s", topic)
+                started = time.monotonic()
+                with X_STAGE_SECONDS.time(stage="wait"):
+                    loaded = await page.wait_for_selector(
+                        '[data-testid="tweet"], [data-testid="emptyState"]',
+                        timeout=_tweets_timeout.current() * 1000,
+                    )
+                _tweets_timeout.observe(time.monotonic() - started)
+            except Exception as e:
+                raise RuntimeError(f"no search results loaded for '{topic}'") from e
+
+            if await loaded.get_attribute("data-testid") == "emptyState":
+                logger.info("X.com has no results for '%s'", topic)
                 return []
 
             # Extract posts from the page
-            posts = await self._extract_posts(topic)
-            return posts[: settings.max_items_per_source]
+            with X_STAGE_SECONDS.time(stage="extract"):
+                return await self._extract_posts(page, topic)
+
+    async def _goto(self, page: Page, url: str):
+        """Navigate with a timeout adapted to recent navigation times."""
+        started = time.monotonic()
+        with X_STAGE_SECONDS.time(stage="navigate"):
+            await page.goto(
+                url, wait_until="domcontentloaded", timeout=_navigate_timeout.current() * 1000
+            )
+        _navigate_timeout.observe(time.monotonic() - started)
 
-        except Exception as e:
-            logger.error("X.com search failed for '%s': %s", topic, e)
-            return []
+    async def _goto_capturing_timeline(self, page: Page, search_url: str) -> dict | None:
+        """Navigate to the search and return the SearchTimeline JSON, if it arrives.
 
-    async def _extract_posts(self, topic: str) -> list[FeedItem]:
-        """Extract post data from currently loaded X.com page."""
-        assert self._page is not None
+        Returns as soon as the response is received. Returns None if it does
+        not arrive within the timeout (e.g. logged out or rate limited).
+        """
+        captured: asyncio.Future = asyncio.get_running_loop().create_future()
 
-        # Scroll once to load more content
-        await self._page.evaluate("window.scrollBy(0, 800)")
-        await self._page.wait_for_timeout(1500)
+        def on_response(response: Response):
+            if not captured.done() and response.ok and is_search_timeline(response.url):
+                captured.set_result(response)
 
-        tweet_elements = await self._page.query_selector_all(
-            '[data-testid="tweet"]'
+        page.on("response", on_response)
+        try:
+            await self._goto(page, search_url)
+            try:
+                started = time.monotonic()
+                with X_STAGE_SECONDS.time(stage="wait"):
+                    response = await asyncio.wait_for(
+                        captured, timeout=_timeline_timeout.current()
+                    )
+                _timeline_timeout.observe(time.monotonic() - started)
+            except asyncio.TimeoutError:
+                return None
+            with X_STAGE_SECONDS.time(stage="extract"):
+                return await response.json()
+        finally:
+            # The page goes back to the pool
+            page.remove_listener("response", on_response)
+
+    async def _extract_posts(self, page: Page, topic: str) -> list[FeedItem]:
+        """Scroll the loaded X.com results, collecting posts as they render.
+
+        Stops as soon as ``max_items_per_source`` posts within the age limit
+        were seen or an older one appears; see ``_SCROLL_TWEETS_JS``.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.max_feed_age_days)
+        result = await page.evaluate(_SCROLL_TWEETS_JS, {
+            "limit": settings.max_items_per_source,
+            "cutoff": cutoff.timestamp() * 1000,
+            "maxScrolls": MAX_SCROLLS,
+            "idleMs": SCROLL_IDLE_MS,
+            "budgetMs": SCROLL_BUDGET_SECONDS * 1000,
+        })
+        logger.debug(
+            "Collected %d tweet(s) for '%s'%s", len(result["tweets"]), topic,
+            ", reached the age limit" if result["reachedCutoff"] else "",
         )
-        items: list[FeedItem] = []
 
-        for tweet_el in tweet_elements[:20]:  # Check more, filter by age
+        items: list[FeedItem] = []
+        for raw in result["tweets"]:
             try:
-                item = await self._parse_tweet(tweet_el)
+                item = self._build_item(raw)
                 if item and self._is_within_age_limit(item.published_at):
                     items.append(item)
             except Exception:
@@ -178,62 +353,42 @@ class XBrowser:
 
         return items
 
-    async def _parse_tweet(self, tweet_el) -> FeedItem | None:
-        """Parse a single tweet element into a FeedItem."""
-        # Get tweet text
-        text_el = await tweet_el.query_selector('[data-testid="tweetText"]')
-        if not text_el:
-            return None
-        text = await text_el.inner_text()
-
-        if not text.strip():
+    def _build_item(self, raw: dict) -> FeedItem | None:
+        """Build a FeedItem from one tweet collected by ``_SCROLL_TWEETS_JS``."""
+        text = raw.get("text")
+        if not text or not text.strip():
             return None
 
-        # Get author handle
-        author = "Unknown"
-        user_links = await tweet_el.query_selector_all('a[role="link"]')
-        for link in user_links:
-            href = await link.get_attribute("href")
-            if href and href.startswith("/") and not href.startswith("/search"):
-                author = href.strip("/")
-                break
+        author = raw.get("author") or "Unknown"
 
         # Get timestamp
-        time_el = await tweet_el.query_selector("time")
         published_at = datetime.now(timezone.utc)
-        if time_el:
-            datetime_attr = await time_el.get_attribute("datetime")
-            if datetime_attr:
-                try:
-                    published_at = datetime.fromisoformat(
-                        datetime_attr.replace("Z", "+00:00")
-                    )
-                except ValueError:
-                    pass
+        datetime_attr = raw.get("datetime")
+        if datetime_attr:
+            try:
+                published_at = datetime.fromisoformat(
+                    datetime_attr.replace("Z", "+00:00")
+                )
+            except ValueError:
+                pass
 
         # Get engagement (approximate from aria-labels)
         engagement = 0
-        for test_id in ["like", "retweet", "reply"]:
-            btn = await tweet_el.query_selector(f'[data-testid="{test_id}"]')
-            if btn:
-                aria = await btn.get_attribute("aria-label")
-                if aria:
-                    parts = aria.split()
-                    if parts:
-                        try:
-                            num_str = parts[0].replace(",", "")
-                            engagement += int(num_str)
-                        except ValueError:
-                            pass
+        for aria in raw.get("engagement") or []:
+            if aria:
+                parts = aria.split()
+                if parts:
+                    try:
+                        num_str = parts[0].replace(",", "")
+                        engagement += int(num_str)
+                    except ValueError:
+                        pass
 
         # Get tweet URL
         url = None
-        link_els = await tweet_el.query_selector_all('a[href*="/status/"]')
-        for link_el in link_els:
-            href = await link_el.get_attribute("href")
-            if href and "/status/" in href:
-                url = f"https://x.com{href}" if href.startswith("/") else href
-                break
+        href = raw.get("url")
+        if href:
+            url = f"https://x.com{href}" if href.startswith("/") else href
 
         return FeedItem(
             title=f"@{author}: {text[:80]}{'...' if len(text) > 80 else ''}",
@@ -247,8 +402,10 @@ class XBrowser:
         )
 
     async def close(self):
-        """Close the browser."""
-        if self._browser:
-            await self._browser.close()
-            self._browser = None
-            self._page = None
+        """Close the private browser pool, if one was started.
+
+        The shared pool is owned by the app lifespan and is left running.
+        """
+        if self._own_pool:
+            await self._own_pool.close()
+            self._own_pool = None
@@ -1,13 +1,45 @@
 import asyncio
 import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
 
 from agent.browsers.x_browser import XBrowser
 from agent.fetchers.reddit_fetcher import RedditFetcher
 from agent.fetchers.rss_fetcher import RSSFetcher
-from models.feed_item import FeedItem
+from config import settings
+from db.item_store import ItemStore, item_store
+from db.redis_item_store import RedisItemStore
+from models.feed_item import FeedItem, NewsSource
+from utils.metrics import ITEMS_FETCHED
+from utils.ranking import engagement_stats, ranker
+from utils.story_clusters import cluster_stories
 
 logger = logging.getLogger(__name__)
 
+# Process-wide concurrency per source, shared by every collector.
+# A single X page can only load one search at a time.
+_SOURCE_LIMITS = {
+    "rss": asyncio.Semaphore(settings.rss_topic_concurrency),
+    "twitter": asyncio.Semaphore(settings.browser_pool_size),
+    "reddit": asyncio.Semaphore(settings.reddit_topic_concurrency),
+}
+
+
+# Items considered for clustering, as a multiple of max_items_per_topic
+CLUSTER_CANDIDATES_FACTOR = 2
+
+
+def merge_items(items: list[FeedItem], topic: str) -> list[dict]:
+    """Collapse a topic's items into stories and serialize the best, best first.
+
+    Only the highest-ranked candidates are clustered; the top
+    ``max_items_per_topic`` stories are then selected.
+    """
+    limit = settings.max_items_per_topic
+    candidates = ranker.top_k(items, topic, limit * CLUSTER_CANDIDATES_FACTOR)
+    stories = ranker.top_k(cluster_stories(candidates), topic, limit)
+    return [story.model_dump(mode="json") for story in stories]
+
 
 class NewsCollector:
     """Coordinates news collection across all sources for given topics."""
@@ -17,42 +49,107 @@ class NewsCollector:
         self.rss_fetcher = RSSFetcher()
         self.x_browser = XBrowser()
         self.reddit_fetcher = RedditFetcher()
+        self.deadline = settings.collect_deadline_seconds
 
-    async def collect(
-        self, topics: list[str]
-    ) -> dict[str, list[dict]]:
-        """Collect posts from all enabled sources, grouped by topic."""
-        results: dict[str, list[dict]] = {}
+    def _source_searches(self) -> dict[str, Callable[[str], Awaitable[list[FeedItem]]]]:
+        """Map each enabled source to its search coroutine function."""
+        searches = {
+            "rss": self.rss_fetcher.search,
+            "twitter": self.x_browser.search,
+            "reddit": self.reddit_fetcher.search,
+        }
+        return {
+            source: search
+            for source, search in searches.items()
+            if source in self.enabled_sources
+        }
 
-        for topic in topics:
-            items: list[FeedItem] = []
-
-            # Build list of fetch tasks based on enabled sources
-            tasks = []
-            if "rss" in self.enabled_sources:
-                tasks.append(self.rss_fetcher.search(topic))
-            if "twitter" in self.enabled_sources:
-                tasks.append(self.x_browser.search(topic))
-            if "reddit" in self.enabled_sources:
-                tasks.append(self.reddit_fetcher.search(topic))
-
-            if not tasks:
-                logger.warning("No sources enabled for collection")
-                results[topic] = []
+    async def _fetch(
+        self,
+        source: str,
+        search: Callable[[str], Awaitable[list[FeedItem]]],
+        topic: str,
+    ) -> dict[str, list[FeedItem]]:
+        """Run one (topic, source) fetch under that source's concurrency limit."""
+        async with _SOURCE_LIMITS[source]:
+            return {topic: await search(topic)}
+
+    async def _fetch_rss(self, topics: list[str]) -> dict[str, list[FeedItem]]:
+        """Match several topics against one snapshot of the feeds, as one RSS search."""
+        async with _SOURCE_LIMITS["rss"]:
+            return await self.rss_fetcher.search_many(topics)
+
+    async def collect_pairs(
+        self, pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], list[FeedItem]]:
+        """Fetch the given (topic, source) pairs concurrently.
+
+        Each pair runs under its source's concurrency limit; all RSS topics
+        are matched in one search against one snapshot of the feeds. Pairs
+        still running when the deadline passes are cancelled; pairs that
+        missed the deadline or raised are absent from the result.
+        """
+        searches = self._source_searches()
+        results: dict[tuple[str, str], list[FeedItem]] = {}
+
+        tasks: dict[asyncio.Task, list[tuple[str, str]]] = {}
+        for topic, source in pairs:
+            if source not in searches or source == "rss":
                 continue
+            task = asyncio.create_task(self._fetch(source, searches[source], topic))
+            tasks[task] = [(topic, source)]
+
+        rss_topics = list(dict.fromkeys(
+            topic for topic, source in pairs if source == "rss" and source in searches
+        ))
+        if rss_topics:
+            task = asyncio.create_task(self._fetch_rss(rss_topics))
+            tasks[task] = [(topic, "rss") for topic in rss_topics]
+
+        if not tasks:
+            return results
 
-            fetched = await asyncio.gather(*tasks, return_exceptions=True)
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
 
-            for result in fetched:
-                if isinstance(result, list):
-                    items.extend(result)
-                elif isinstance(result, Exception):
-                    logger.warning("Source fetch failed: %s", result)
+        if pending:
+            for task in pending:
+                task.cancel()
+                for topic, source in tasks[task]:
+                    logger.warning(
+                        "Source %s for topic '%s' missed the %.0fs deadline",
+                        source, topic, self.deadline,
+                    )
+            await asyncio.gather(*pending, return_exceptions=True)
 
-            # Sort by most recent first
-            items.sort(key=lambda x: x.published_at, reverse=True)
+        for task in done:
+            if task.exception() is not None:
+                logger.warning("Source fetch failed: %s", task.exception())
+                continue
+            for topic, source in tasks[task]:
+                items = task.result()[topic]
+                results[(topic, source)] = items
+                engagement_stats.observe(items)
+                ITEMS_FETCHED.inc(len(items), source=source)
+
+        return results
 
-            results[topic] = [item.model_dump(mode="json") for item in items]
+    async def collect_from_store(
+        self, topics: list[str], store: ItemStore | RedisItemStore | None = None
+    ) -> dict[str, list[dict]]:
+        """Answer a collection request from ingested items instead of live fetches.
+
+        Items are matched through the store's topic index (in memory, or
+        the shared Redis store) and every match is ranked, so each topic's
+        best stories come first.
+        """
+        store = store or item_store
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.max_feed_age_days)
+        sources = [NewsSource(source) for source in self.enabled_sources]
+
+        results: dict[str, list[dict]] = {}
+        for topic in topics:
+            matches = await store.match(topic, sources=sources, since=cutoff)
+            results[topic] = merge_items((item for item, _ in matches), topic)
 
         return results
 
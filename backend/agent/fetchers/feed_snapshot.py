@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from time import mktime
+
+import feedparser
+import httpx
+
+from agent.fetchers.http_client import host_slot
+from config import settings
+from db.redis_client import get_redis, feed_cache_key
+from utils.circuit_breaker import AdaptiveTimeout, CircuitOpenError, get_breaker
+
+logger = logging.getLogger(__name__)
+
+# Entries beyond this many per feed are never matched
+MAX_ENTRIES_PER_FEED = 50
+
+# Upper bound for a feed download; the adaptive timeout stays below it
+FEED_TIMEOUT_SECONDS = 15.0
+
+
+@dataclass
+class FeedEntry:
+    """A feed entry normalized once at parse time."""
+    title: str
+    summary: str
+    link: str | None
+    author: str | None
+    published: datetime
+
+
+@dataclass
+class FeedSnapshot:
+    """Parsed entries of one feed as of ``fetched_at`` (monotonic seconds).
+
+    ``etag`` and ``last_modified`` are the validators from the response the
+    entries were parsed from, sent back on the next conditional GET.
+    """
+    url: str
+    title: str
+    entries: list[FeedEntry]
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def to_record(self) -> dict:
+        """Serialize for the persistent feed cache."""
+        return {
+            "url": self.url,
+            "title": self.title,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "entries": [
+                {
+                    "title": e.title,
+                    "summary": e.summary,
+                    "link": e.link,
+                    "author": e.author,
+                    "published": e.published.isoformat(),
+                }
+                for e in self.entries
+            ],
+        }
+
+    @classmethod
+    def from_record(cls, record: dict) -> "FeedSnapshot":
+        """Rebuild a snapshot from the persistent feed cache.
+
+        ``fetched_at`` is set to 0 so the snapshot is always revalidated.
+        """
+        return cls(
+            url=record["url"],
+            title=record["title"],
+            entries=[
+                FeedEntry(
+                    title=e["title"],
+                    summary=e["summary"],
+                    link=e["link"],
+                    author=e["author"],
+                    published=datetime.fromisoformat(e["published"]),
+                )
+                for e in record["entries"]
+            ],
+            fetched_at=0.0,
+            etag=record.get("etag"),
+            last_modified=record.get("last_modified"),
+        )
+
+
+def _parse_date(entry) -> datetime:
+    """Parse published date from feed entry."""
+    if hasattr(entry, "published_parsed") and entry.published_parsed:
+        return datetime.fromtimestamp(
+            mktime(entry.published_parsed), tz=timezone.utc
+        )
+    return datetime.now(timezone.utc)
+
+
+def parse_feed(
+    url: str,
+    text: str,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> FeedSnapshot:
+    """Parse raw feed XML into a snapshot of normalized entries."""
+    feed = feedparser.parse(text)
+    entries = [
+        FeedEntry(
+            title=entry.get("title", ""),
+            summary=entry.get("summary", ""),
+            link=entry.get("link"),
+            author=entry.get("author"),
+            published=_parse_date(entry),
+        )
+        for entry in feed.entries[:MAX_ENTRIES_PER_FEED]
+    ]
+    return FeedSnapshot(
+        url=url,
+        title=feed.feed.get("title", url),
+        entries=entries,
+        fetched_at=time.monotonic(),
+        etag=etag,
+        last_modified=last_modified,
+    )
+
+
+class FeedSnapshotCache:
+    """In-memory, TTL-bounded cache of parsed feeds shared by all requests.
+
+    Concurrent lookups of the same URL wait on a per-URL lock, so a feed is
+    downloaded and parsed at most once per TTL no matter how many topics
+    are being matched against it.
+
+    Expired snapshots are revalidated with a conditional GET. Parsed entries
+    and validators are also persisted to Redis (when connected), so a
+    restarted process can answer a 304 without re-downloading the feed.
+
+    Each feed URL has its own circuit breaker and adaptive timeout: a feed
+    that keeps failing is skipped (its last snapshot, if any, is served)
+    until a half-open probe succeeds.
+    """
+
+    def __init__(self, ttl_seconds: float | None = None):
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.rss_snapshot_ttl_seconds
+        )
+        self._snapshots: dict[str, FeedSnapshot] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._timeouts: dict[str, AdaptiveTimeout] = {}
+
+    def _fresh(self, url: str) -> FeedSnapshot | None:
+        snapshot = self._snapshots.get(url)
+        if snapshot and time.monotonic() - snapshot.fetched_at < self.ttl_seconds:
+            return snapshot
+        return None
+
+    async def get(self, url: str, client: httpx.AsyncClient) -> FeedSnapshot:
+        """Return a fresh snapshot of ``url``, fetching it if needed."""
+        snapshot = self._fresh(url)
+        if snapshot:
+            return snapshot
+
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            # Another request may have refreshed it while we waited
+            snapshot = self._fresh(url)
+            if snapshot:
+                return snapshot
+
+            stale = self._snapshots.get(url) or await self._load_stored(url)
+
+            breaker = get_breaker(f"rss:{url}")
+            if not breaker.allow():
+                if stale:
+                    return stale
+                raise CircuitOpenError(f"circuit open for {url}")
+
+            headers = {}
+            if stale and stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale and stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+
+            timeout = self._timeouts.setdefault(
+                url, AdaptiveTimeout(default=FEED_TIMEOUT_SECONDS, floor=2.0)
+            )
+            started = time.monotonic()
+            try:
+                async with host_slot(url):
+                    response = await client.get(
+                        url, headers=headers, timeout=timeout.current()
+                    )
+                if response.status_code != 304 or not stale:
+                    response.raise_for_status()
+            except Exception:
+                breaker.record_failure()
+                raise
+            breaker.record_success()
+            timeout.observe(time.monotonic() - started)
+
+            if response.status_code == 304 and stale:
+                stale.fetched_at = time.monotonic()
+                self._snapshots[url] = stale
+                return stale
+
+            snapshot = parse_feed(
+                url,
+                response.text,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+            self._snapshots[url] = snapshot
+            await self._store(snapshot)
+            return snapshot
+
+    async def _load_stored(self, url: str) -> FeedSnapshot | None:
+        """Load a persisted snapshot from Redis, if any."""
+        redis = get_redis()
+        if not redis:
+            return None
+        try:
+            cached = await redis.get(feed_cache_key(url))
+            if cached:
+                return FeedSnapshot.from_record(json.loads(cached))
+        except Exception as e:
+            logger.warning("Redis feed cache read failed: %s", e)
+        return None
+
+    async def _store(self, snapshot: FeedSnapshot):
+        """Persist a snapshot and its validators to Redis, if connected."""
+        if not (snapshot.etag or snapshot.last_modified):
+            # Nothing to revalidate against
+            return
+        redis = get_redis()
+        if not redis:
+            return
+        try:
+            await redis.set(
+                feed_cache_key(snapshot.url),
+                json.dumps(snapshot.to_record()),
+                ex=settings.rss_feed_cache_ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning("Redis feed cache write failed: %s", e)
+
+    def clear(self):
+        self._snapshots.clear()
+
+
+# Process-wide snapshot cache
+feed_snapshots = FeedSnapshotCache()
@@ -0,0 +1,86 @@
+"""App-lifetime HTTP client shared by every outbound fetcher.
+
+One ``httpx.AsyncClient`` keeps connections (and TLS sessions) alive across
+requests and speaks HTTP/2 where the server supports it. Requests to one
+host are additionally bounded by ``host_slot``, so a fan-out over many
+feeds on the same host does not open a connection per feed.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Default request timeout; callers may pass a shorter one per request
+DEFAULT_TIMEOUT_SECONDS = 15.0
+
+_client: httpx.AsyncClient | None = None
+_host_slots: dict[str, asyncio.Semaphore] = {}
+
+
+def _new_client() -> httpx.AsyncClient:
+    # HTTP/2 needs the h2 package (httpx[http2])
+    http2 = importlib.util.find_spec("h2") is not None
+    if not http2:
+        logger.warning("h2 is not installed — outbound HTTP uses HTTP/1.1")
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=DEFAULT_TIMEOUT_SECONDS,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_seconds,
+        ),
+    )
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Create the app-scoped HTTP client."""
+    global _client
+    _client = _new_client()
+    return _client
+
+
+async def close_http_client():
+    """Close the app-scoped HTTP client and its pooled connections."""
+    global _client
+    if _client:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient | None:
+    """Get the app-scoped HTTP client. Returns None if not created."""
+    return _client
+
+
+@asynccontextmanager
+async def http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """The app-scoped client, or a temporary one if none was created."""
+    if _client is not None:
+        yield _client
+        return
+
+    client = _new_client()
+    try:
+        yield client
+    finally:
+        await client.aclose()
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[None]:
+    """Hold one of the ``http_max_per_host`` request slots for ``url``'s host."""
+    host = urlsplit(url).netloc
+    slots = _host_slots.setdefault(host, asyncio.Semaphore(settings.http_max_per_host))
+    async with slots:
+        yield
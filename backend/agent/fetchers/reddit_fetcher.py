@@ -1,10 +1,17 @@
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable
 
 import asyncpraw
+from asyncpraw.models import Submission, Subreddit
 
 from config import settings
 from models.feed_item import FeedItem, NewsSource
+from utils.circuit_breaker import AdaptiveTimeout, get_breaker
+from utils.metrics import FETCH_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +25,12 @@ DEFAULT_SUBREDDITS = [
     "politics",
 ]
 
+# Wait for the rate-limit window to reset when fewer requests than this remain
+RATE_LIMIT_FLOOR = 5
+
+# Per-subreddit request timeout, adapted to observed latency
+_request_timeout = AdaptiveTimeout(default=15.0, floor=3.0)
+
 # Map max_feed_age_days to Reddit's time_filter options
 def _get_reddit_time_filter(max_days: int) -> str:
     """Convert max age in days to Reddit's time_filter parameter."""
@@ -32,6 +45,60 @@ def _get_reddit_time_filter(max_days: int) -> str:
     return "all"
 
 
+def _new_client() -> asyncpraw.Reddit:
+    return asyncpraw.Reddit(
+        client_id=settings.reddit_client_id,
+        client_secret=settings.reddit_client_secret,
+        user_agent=settings.reddit_user_agent,
+        oauth_url=settings.reddit_oauth_url,
+        reddit_url=settings.reddit_url,
+    )
+
+
+_reddit: asyncpraw.Reddit | None = None
+
+# Bounds in-flight Reddit requests across every topic and request
+_request_slots = asyncio.Semaphore(settings.reddit_request_concurrency)
+
+
+async def init_reddit() -> asyncpraw.Reddit | None:
+    """Create the app-scoped Reddit client. Returns None if not configured."""
+    global _reddit
+    if not settings.reddit_client_id or not settings.reddit_client_secret:
+        return None
+    _reddit = _new_client()
+    return _reddit
+
+
+async def close_reddit():
+    """Close the app-scoped Reddit client."""
+    global _reddit
+    if _reddit:
+        await _reddit.close()
+        _reddit = None
+
+
+def get_reddit() -> asyncpraw.Reddit | None:
+    """Get the app-scoped Reddit client. Returns None if not created."""
+    return _reddit
+
+
+async def _respect_rate_limit(reddit: asyncpraw.Reddit):
+    """Sleep until the rate-limit window resets if it is nearly used up."""
+    limits = reddit.auth.limits
+    remaining = limits.get("remaining")
+    reset_timestamp = limits.get("reset_timestamp")
+    if remaining is None or reset_timestamp is None or remaining >= RATE_LIMIT_FLOOR:
+        return
+    delay = reset_timestamp - time.time()
+    if delay > 0:
+        logger.warning(
+            "Reddit rate limit nearly exhausted (%d left) — waiting %.0fs",
+            remaining, delay,
+        )
+        await asyncio.sleep(delay)
+
+
 class RedditFetcher:
     """Search Reddit for posts matching topics using asyncpraw."""
 
@@ -43,71 +110,129 @@ class RedditFetcher:
         cutoff = datetime.now(timezone.utc) - timedelta(days=settings.max_feed_age_days)
         return published >= cutoff
 
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[asyncpraw.Reddit]:
+        """The app-scoped client, or a temporary one if none was created."""
+        shared = get_reddit()
+        if shared is not None:
+            yield shared
+            return
+
+        reddit = _new_client()
+        try:
+            yield reddit
+        finally:
+            await reddit.close()
+
+    def _to_item(self, submission, sub_name: str) -> FeedItem | None:
+        """Convert a submission to a FeedItem, or None if it should be skipped."""
+        # Filter low engagement posts
+        if submission.score < 10:
+            return None
+
+        published = datetime.fromtimestamp(
+            submission.created_utc, tz=timezone.utc
+        )
+
+        # Double-check age limit (Reddit's time_filter is coarse)
+        if not self._is_within_age_limit(published):
+            return None
+
+        content = submission.selftext or submission.title
+        # For link posts, include the URL in the content
+        if submission.is_self is False and submission.url:
+            content = f"{content}\n\nLink: {submission.url}"
+
+        return FeedItem(
+            title=submission.title,
+            content=content,
+            url=f"https://reddit.com{submission.permalink}",
+            source=NewsSource.REDDIT,
+            source_name=f"r/{sub_name}",
+            author=(
+                str(submission.author)
+                if submission.author
+                else None
+            ),
+            published_at=published,
+            engagement=submission.score,
+        )
+
+    async def _from_subreddit(
+        self,
+        reddit: asyncpraw.Reddit,
+        sub_name: str,
+        listing: Callable[[Subreddit], AsyncIterator[Submission]],
+    ) -> list[FeedItem]:
+        """Run one listing (search, hot, ...) on a subreddit under the request limit.
+
+        Skipped while Reddit's circuit breaker is open.
+        """
+        items: list[FeedItem] = []
+        breaker = get_breaker("reddit")
+        if not breaker.allow():
+            return items
+        try:
+            async with _request_slots:
+                await _respect_rate_limit(reddit)
+                started = time.monotonic()
+                async with asyncio.timeout(_request_timeout.current()):
+                    subreddit = await reddit.subreddit(sub_name)
+                    async for submission in listing(subreddit):
+                        item = self._to_item(submission, sub_name)
+                        if item:
+                            items.append(item)
+                _request_timeout.observe(time.monotonic() - started)
+        except Exception as e:
+            breaker.record_failure()
+            logger.warning("Failed to search r/%s: %s", sub_name, e)
+            return items
+        breaker.record_success()
+        return items
+
+    async def _from_all_subreddits(
+        self, listing: Callable[[Subreddit], AsyncIterator[Submission]]
+    ) -> list[FeedItem]:
+        """Run a listing on every subreddit concurrently."""
+        items: list[FeedItem] = []
+
+        try:
+            async with self._client() as reddit:
+                batches = await asyncio.gather(*(
+                    self._from_subreddit(reddit, sub_name, listing)
+                    for sub_name in self.subreddits
+                ))
+            for batch in batches:
+                items.extend(batch)
+
+        except Exception as e:
+            logger.error("Reddit API error: %s", e)
+
+        return items
+
+    @FETCH_SECONDS.time(source="reddit")
     async def search(self, topic: str) -> list[FeedItem]:
         """Search Reddit for posts about a topic."""
         if not settings.reddit_client_id or not settings.reddit_client_secret:
             logger.warning("Reddit API credentials not configured — skipping")
             return []
 
-        items: list[FeedItem] = []
         time_filter = _get_reddit_time_filter(settings.max_feed_age_days)
-
-        try:
-            reddit = asyncpraw.Reddit(
-                client_id=settings.reddit_client_id,
-                client_secret=settings.reddit_client_secret,
-                user_agent=settings.reddit_user_agent,
+        items = await self._from_all_subreddits(
+            lambda subreddit: subreddit.search(
+                topic, sort="relevance", time_filter=time_filter, limit=10
             )
-
-            try:
-                for sub_name in self.subreddits:
-                    try:
-                        subreddit = await reddit.subreddit(sub_name)
-                        async for submission in subreddit.search(
-                            topic, sort="relevance", time_filter=time_filter, limit=10
-                        ):
-                            # Filter low engagement posts
-                            if submission.score < 10:
-                                continue
-
-                            published = datetime.fromtimestamp(
-                                submission.created_utc, tz=timezone.utc
-                            )
-
-                            # Double-check age limit (Reddit's time_filter is coarse)
-                            if not self._is_within_age_limit(published):
-                                continue
-
-                            content = submission.selftext or submission.title
-                            # For link posts, include the URL in the content
-                            if submission.is_self is False and submission.url:
-                                content = f"{content}\n\nLink: {submission.url}"
-
-                            items.append(
-                                FeedItem(
-                                    title=submission.title,
-                                    content=content,
-                                    url=f"https://reddit.com{submission.permalink}",
-                                    source=NewsSource.REDDIT,
-                                    source_name=f"r/{sub_name}",
-                                    author=(
-                                        str(submission.author)
-                                        if submission.author
-                                        else None
-                                    ),
-                                    published_at=published,
-                                    engagement=submission.score,
-                                )
-                            )
-                    except Exception as e:
-                        logger.warning("Failed to search r/%s: %s", sub_name, e)
-                        continue
-            finally:
-                await reddit.close()
-
-        except Exception as e:
-            logger.error("Reddit API error: %s", e)
+        )
 
         # Sort by engagement and limit
         items.sort(key=lambda x: x.engagement, reverse=True)
         return items[: settings.max_items_per_source]
+
+    async def latest(self, limit: int = 25) -> list[FeedItem]:
+        """Fetch the current hot posts of every subreddit, without topic filtering."""
+        if not settings.reddit_client_id or not settings.reddit_client_secret:
+            return []
+
+        return await self._from_all_subreddits(
+            lambda subreddit: subreddit.hot(limit=limit)
+        )
@@ -1,12 +1,17 @@
+import asyncio
+import heapq
 import logging
 from datetime import datetime, timedelta, timezone
 
-import feedparser
 import httpx
 
+from agent.fetchers.feed_snapshot import FeedEntry, FeedSnapshot, feed_snapshots
+from agent.fetchers.http_client import http_client
 from config import settings
 from models.feed_item import FeedItem, NewsSource
-from utils.topic_matcher import match_topic
+from utils.circuit_breaker import CircuitOpenError
+from utils.metrics import FETCH_SECONDS
+from utils.topic_matcher import match_many
 
 logger = logging.getLogger(__name__)
 
@@ -26,61 +31,82 @@ class RSSFetcher:
         cutoff = datetime.now(timezone.utc) - timedelta(days=settings.max_feed_age_days)
         return published >= cutoff
 
+    async def _load_snapshots(self) -> list[FeedSnapshot]:
+        """Get a parsed snapshot of every configured feed, fetching concurrently."""
+        slots = asyncio.Semaphore(settings.rss_feed_concurrency)
+
+        async def load(client: httpx.AsyncClient, feed_url: str) -> FeedSnapshot | None:
+            try:
+                async with slots:
+                    return await feed_snapshots.get(feed_url, client)
+            except CircuitOpenError:
+                logger.debug("Skipping RSS feed %s: circuit open", feed_url)
+            except Exception as e:
+                logger.warning("Failed to fetch RSS feed %s: %s", feed_url, e)
+            return None
+
+        async with http_client() as client:
+            snapshots = await asyncio.gather(
+                *(load(client, feed_url) for feed_url in self.feed_urls)
+            )
+
+        return [snapshot for snapshot in snapshots if snapshot is not None]
+
     async def search(self, topic: str) -> list[FeedItem]:
         """Fetch RSS feeds and filter entries matching the topic."""
-        items: list[FeedItem] = []
-
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            for feed_url in self.feed_urls:
-                try:
-                    response = await client.get(feed_url)
-                    response.raise_for_status()
-                    feed = feedparser.parse(response.text)
-
-                    feed_title = feed.feed.get("title", feed_url)
-
-                    for entry in feed.entries[:50]:  # Check more entries, filter by relevance
-                        title = entry.get("title", "")
-                        summary = entry.get("summary", "")
-                        combined = f"{title} {summary}"
-
-                        # Use topic matcher with keyword expansion
-                        result = match_topic(combined, topic)
-                        if not result.matched:
-                            continue
-
-                        published = self._parse_date(entry)
-
-                        # Skip items older than the configured age limit
-                        if not self._is_within_age_limit(published):
-                            continue
-
-                        items.append(
-                            FeedItem(
-                                title=title,
-                                content=summary,
-                                url=entry.get("link"),
-                                source=NewsSource.RSS,
-                                source_name=feed_title,
-                                author=entry.get("author"),
-                                published_at=published,
-                                engagement=int(result.score * 100),  # Use relevance as engagement proxy
-                            )
-                        )
-                except Exception as e:
-                    logger.warning("Failed to fetch RSS feed %s: %s", feed_url, e)
-                    continue
-
-        # Sort by relevance-based engagement and limit
-        items.sort(key=lambda x: x.engagement, reverse=True)
-        return items[: settings.max_items_per_source]
-
-    def _parse_date(self, entry) -> datetime:
-        """Parse published date from feed entry."""
-        if hasattr(entry, "published_parsed") and entry.published_parsed:
-            from time import mktime
-
-            return datetime.fromtimestamp(
-                mktime(entry.published_parsed), tz=timezone.utc
+        results = await self.search_many([topic])
+        return results[topic]
+
+    @FETCH_SECONDS.time(source="rss")
+    async def search_many(self, topics: list[str]) -> dict[str, list[FeedItem]]:
+        """Match several topics against a single snapshot of every feed."""
+        snapshots = await self._load_snapshots()
+
+        # Skip items older than the configured age limit
+        entries = [
+            (snapshot, entry)
+            for snapshot in snapshots
+            for entry in snapshot.entries
+            if self._is_within_age_limit(entry.published)
+        ]
+
+        # Use topic matcher with keyword expansion, one pass per entry
+        scores = match_many(
+            [f"{entry.title} {entry.summary}" for _, entry in entries], topics
+        )
+
+        results: dict[str, list[FeedItem]] = {}
+        for topic in topics:
+            # Keep the most relevant entries; ties keep feed order
+            matched = heapq.nlargest(
+                settings.max_items_per_source,
+                (
+                    (row[topic].score, -i)
+                    for i, row in enumerate(scores)
+                    if row[topic].matched
+                ),
             )
-        return datetime.now(timezone.utc)
+            results[topic] = [self._to_item(*entries[-i]) for _, i in matched]
+
+        return results
+
+    def _to_item(self, snapshot: FeedSnapshot, entry: FeedEntry) -> FeedItem:
+        """Build a FeedItem from a snapshot entry."""
+        return FeedItem(
+            title=entry.title,
+            content=entry.summary,
+            url=entry.link,
+            source=NewsSource.RSS,
+            source_name=snapshot.title,
+            author=entry.author,
+            published_at=entry.published,
+        )
+
+    async def latest(self) -> list[FeedItem]:
+        """All in-window entries of every feed, without topic filtering."""
+        return [
+            self._to_item(snapshot, entry)
+            for snapshot in await self._load_snapshots()
+            for entry in snapshot.entries
+            if self._is_within_age_limit(entry.published)
+        ]
@@ -0,0 +1,173 @@
+"""Background ingestion: poll every source into the item stores.
+
+Runs inside each API worker when ``ingest_enabled`` is set, or on its own
+so that API workers only read the shared Redis item store:
+
+    INGEST_IN_PROCESS=false python -m agent.ingest
+"""
+
+import asyncio
+import logging
+import signal
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from agent.browsers.browser_pool import init_browser_pool, close_browser_pool
+from agent.browsers.x_browser import XBrowser
+from agent.fetchers.http_client import init_http_client, close_http_client
+from agent.fetchers.reddit_fetcher import RedditFetcher, init_reddit, close_reddit
+from agent.fetchers.rss_fetcher import RSSFetcher
+from config import settings
+from db.item_store import ItemStore, item_store
+from db.redis_client import init_redis, close_redis
+from db.redis_item_store import RedisItemStore, redis_item_store
+from models.feed_item import FeedItem
+from utils.metrics import ITEMS_FETCHED
+from utils.ranking import engagement_stats
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionWorker:
+    """Continuously polls every source and writes its items into the item stores.
+
+    Each source runs in its own loop: all configured RSS feeds, the hot
+    listing of the default subreddits, and the X searches on the watch-list.
+    Items go to the in-memory store and, when Redis is up, to the shared
+    Redis store. ``/api/collect`` then answers from a store instead of
+    fetching live.
+    """
+
+    def __init__(
+        self,
+        store: ItemStore | None = None,
+        shared_store: RedisItemStore | None = None,
+    ):
+        self.store = store or item_store
+        self.shared_store = shared_store or redis_item_store
+        self.interval = settings.ingest_interval_seconds
+        self.rss_fetcher = RSSFetcher()
+        self.reddit_fetcher = RedditFetcher()
+        self.x_browser = XBrowser()
+        self.watch_list = [
+            q.strip() for q in settings.x_watch_list.split(",") if q.strip()
+        ]
+        self._tasks: list[asyncio.Task] = []
+
+    async def restore(self) -> int:
+        """Load the items persisted in Redis into the in-memory store.
+
+        Lets a restarted worker answer with its previous items before the
+        first polls finish. Returns how many were loaded.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.max_feed_age_days)
+        items = await self.shared_store.load(since=cutoff)
+        self.store.add(items)
+        engagement_stats.observe(items)
+        if items:
+            logger.info("Restored %d item(s) from Redis", len(items))
+        return len(items)
+
+    def start(self):
+        """Start one polling loop per source."""
+        polls: dict[str, Callable[[], Awaitable[list[FeedItem]]]] = {
+            "rss": self.rss_fetcher.latest,
+            "reddit": self.reddit_fetcher.latest,
+        }
+        if self.watch_list:
+            polls["twitter"] = self._poll_x
+        self._tasks = [
+            asyncio.create_task(self._run(source, poll))
+            for source, poll in polls.items()
+        ]
+        logger.info("Ingestion started for %s", ", ".join(polls))
+
+    async def stop(self):
+        """Cancel the polling loops and release the browser."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.x_browser.close()
+
+    async def _run(self, source: str, poll: Callable[[], Awaitable[list[FeedItem]]]):
+        while True:
+            try:
+                items = await poll()
+                added = self.store.add(items)
+                await self.shared_store.add(items)
+                engagement_stats.observe(items)
+                ITEMS_FETCHED.inc(len(items), source=source)
+                cutoff = datetime.now(timezone.utc) - timedelta(days=settings.max_feed_age_days)
+                self.store.trim(cutoff)
+                await self.shared_store.trim(cutoff)
+                logger.info(
+                    "Ingested %d %s item(s), %d new", len(items), source, added
+                )
+            except Exception as e:
+                logger.warning("Ingestion of %s failed: %s", source, e)
+            await asyncio.sleep(self.interval)
+
+    async def _poll_x(self) -> list[FeedItem]:
+        items: list[FeedItem] = []
+        for query in self.watch_list:
+            items.extend(await self.x_browser.search(query))
+        return items
+
+
+_worker: IngestionWorker | None = None
+
+
+async def start_ingestion() -> IngestionWorker:
+    """Restore persisted items and start the background ingestion worker."""
+    global _worker
+    _worker = IngestionWorker()
+    await _worker.restore()
+    _worker.start()
+    return _worker
+
+
+async def stop_ingestion():
+    """Stop the background ingestion worker."""
+    global _worker
+    if _worker:
+        await _worker.stop()
+        _worker = None
+
+
+def get_ingestion_worker() -> IngestionWorker | None:
+    """Get the running ingestion worker. Returns None if ingestion is off."""
+    return _worker
+
+
+async def run_standalone():
+    """Ingest until SIGINT or SIGTERM, writing to the shared Redis store."""
+    if await init_redis() is None:
+        raise SystemExit("Standalone ingestion needs Redis to share its items")
+    await init_http_client()
+    if not settings.x_browser_service_url:
+        await init_browser_pool()
+    await init_reddit()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopping.set)
+
+    await start_ingestion()
+    try:
+        await stopping.wait()
+    finally:
+        await stop_ingestion()
+        await close_reddit()
+        await close_browser_pool()
+        await close_http_client()
+        await close_redis()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    asyncio.run(run_standalone())
@@ -0,0 +1,107 @@
+"""Micro-benchmark: compiled TopicMatcher vs the original match_topic loop.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_topic_matcher --entries 5000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from utils.topic_matcher import (
+    TOPIC_EXPANSIONS,
+    MatchResult,
+    match_many,
+    match_topic,
+)
+
+TOPICS = ["AI", "crypto", "climate", "space", "politics"]
+
+FILLER = (
+    "the of and to in said report government people new year world after "
+    "first market news today week officials according statement minister "
+    "company shares growth data plans city police court"
+).split()
+
+
+def legacy_match_topic(text: str, topic: str) -> MatchResult:
+    """The original implementation, kept here as the baseline."""
+    normalized_text = re.sub(r"\s+", " ", text.lower().strip())
+    normalized = re.sub(r"\s+", " ", topic.lower().strip())
+    keywords = [normalized]
+    for key, expansions in TOPIC_EXPANSIONS.items():
+        if key == normalized or normalized in expansions:
+            keywords.extend(expansions)
+            if key not in keywords:
+                keywords.append(key)
+            break
+    keywords = list(set(keywords))
+
+    if not normalized_text:
+        return MatchResult(matched=False, score=0.0)
+
+    match_count = sum(1 for keyword in keywords if keyword in normalized_text)
+    if match_count == 0:
+        return MatchResult(matched=False, score=0.0)
+
+    score = min(1.0, match_count / max(1, len(keywords) / 2))
+    if normalized in normalized_text[:100]:
+        score = min(1.0, score + 0.3)
+    return MatchResult(matched=True, score=round(score, 2))
+
+
+def synthetic_entries(count: int, seed: int = 42) -> list[str]:
+    """Title + summary strings with a sprinkling of topic keywords."""
+    rng = random.Random(seed)
+    keywords = [k for exps in TOPIC_EXPANSIONS.values() for k in exps]
+    entries = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(20, 80))]
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        entries.append(" ".join(words).capitalize())
+    return entries
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.entries)
+
+    # Results must be identical before timings mean anything
+    expected = [{t: legacy_match_topic(e, t) for t in TOPICS} for e in entries]
+    assert match_many(entries, TOPICS) == expected
+    assert [{t: match_topic(e, t) for t in TOPICS} for e in entries] == expected
+
+    cases = {
+        "legacy match_topic": lambda: [
+            legacy_match_topic(e, t) for e in entries for t in TOPICS
+        ],
+        "match_topic": lambda: [match_topic(e, t) for e in entries for t in TOPICS],
+        "match_many": lambda: match_many(entries, TOPICS),
+    }
+
+    print(f"{args.entries} entries x {len(TOPICS)} topics, best of {args.repeat}")
+    baseline = None
+    for name, fn in cases.items():
+        elapsed = _time(fn, args.repeat)
+        baseline = baseline or elapsed
+        print(f"  {name:<20} {elapsed * 1000:8.1f} ms  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Local stand-ins for the RSS feeds, Reddit API and X.com search page.
+
+One Starlette app serves all three, so the backend can be pointed at it
+with ``RSS_FEEDS``, ``REDDIT_OAUTH_URL``/``REDDIT_URL`` and ``X_BASE_URL``:
+
+    /feeds/{n}.xml                    RSS 2.0 feed with ETag revalidation
+    /api/v1/access_token              Reddit app-only OAuth token
+    /r/{subreddit}/search|hot         Reddit listings (asyncpraw-compatible)
+    /search?q=...                     X search page; renders tweets in the DOM
+    /i/api/graphql/{id}/SearchTimeline  the GraphQL JSON that page loads
+
+Content is generated deterministically from the request, so runs are
+comparable across commits. Run standalone from the backend directory:
+
+    python -m benchmarks.fake_services --port 8900 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.routing import Route
+
+from benchmarks.bench_topic_matcher import synthetic_entries
+
+TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+@dataclass
+class FakeConfig:
+    feeds: int = 20
+    feed_entries: int = 50
+    tweets: int = 20
+    reddit_posts: int = 10
+    rss_latency: float = 0.05  # Seconds added to every response
+    reddit_latency: float = 0.05
+    x_latency: float = 0.2
+
+
+def _rng(*parts: object) -> random.Random:
+    return random.Random(zlib.crc32("|".join(map(str, parts)).encode()))
+
+
+class FakeServices:
+    """Generates and serves the fake content; each feed is generated once."""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.started = datetime.now(timezone.utc)
+        self._feeds: dict[int, tuple[bytes, str]] = {}
+        self.requests: dict[str, int] = {"rss": 0, "reddit": 0, "x": 0}
+
+    def _published(self, rng: random.Random) -> datetime:
+        """A time within the last two days of server start."""
+        return self.started - timedelta(minutes=rng.randint(0, 2 * 24 * 60))
+
+    # RSS
+
+    def _feed(self, n: int) -> tuple[bytes, str]:
+        if n not in self._feeds:
+            rng = _rng("feed", n)
+            items = []
+            for i, text in enumerate(synthetic_entries(self.config.feed_entries, seed=n)):
+                words = text.split()
+                title, summary = " ".join(words[:10]), " ".join(words[10:])
+                items.append(
+                    "<item>"
+                    f"<title>{escape(title)}</title>"
+                    f"<description>{escape(summary)}</description>"
+                    f"<link>https://news{n}.example.com/story/{i}</link>"
+                    f"<guid>https://news{n}.example.com/story/{i}</guid>"
+                    f"<pubDate>{format_datetime(self._published(rng))}</pubDate>"
+                    "</item>"
+                )
+            body = (
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<rss version="2.0"><channel>'
+                f"<title>Bench Feed {n}</title>"
+                f"<link>https://news{n}.example.com/</link>"
+                f"{''.join(items)}"
+                "</channel></rss>"
+            ).encode()
+            self._feeds[n] = (body, f'"{hashlib.md5(body).hexdigest()}"')
+        return self._feeds[n]
+
+    async def feed(self, request: Request) -> Response:
+        self.requests["rss"] += 1
+        await asyncio.sleep(self.config.rss_latency)
+        n = int(request.path_params["name"].removesuffix(".xml"))
+        body, etag = self._feed(n)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(body, media_type="application/rss+xml", headers={"ETag": etag})
+
+    # Reddit
+
+    async def access_token(self, request: Request) -> JSONResponse:
+        return JSONResponse({
+            "access_token": "bench-token",
+            "token_type": "bearer",
+            "expires_in": 86400,
+            "scope": "*",
+        })
+
+    async def listing(self, request: Request) -> JSONResponse:
+        self.requests["reddit"] += 1
+        await asyncio.sleep(self.config.reddit_latency)
+        sub = request.path_params["subreddit"]
+        query = request.query_params.get("q", "")
+        rng = _rng("reddit", sub, request.path_params["listing"], query)
+        limit = min(int(request.query_params.get("limit", 25)), self.config.reddit_posts)
+
+        children = []
+        for text in synthetic_entries(limit, seed=rng.randrange(1 << 30)):
+            post_id = f"{rng.randrange(36 ** 6):06x}"
+            title = " ".join(([query] if query else []) + text.split()[:12])
+            is_self = rng.random() < 0.5
+            children.append({"kind": "t3", "data": {
+                "id": post_id,
+                "name": f"t3_{post_id}",
+                "title": title,
+                "selftext": text if is_self else "",
+                "is_self": is_self,
+                "url": (
+                    f"https://www.reddit.com/r/{sub}/comments/{post_id}/"
+                    if is_self else f"https://news.example.com/{post_id}"
+                ),
+                "permalink": f"/r/{sub}/comments/{post_id}/bench/",
+                "subreddit": sub,
+                "author": f"user{rng.randrange(1000)}",
+                "score": rng.randint(0, 20000),
+                "num_comments": rng.randint(0, 500),
+                "created_utc": self._published(rng).timestamp(),
+            }})
+
+        return JSONResponse(
+            {"kind": "Listing", "data": {"children": children, "after": None, "before": None}},
+            # A window about to reset, so asyncprawcore does not pace requests
+            headers={
+                "x-ratelimit-remaining": "990",
+                "x-ratelimit-used": "10",
+                "x-ratelimit-reset": "1",
+            },
+        )
+
+    # X.com
+
+    def _timeline(self, query: str) -> dict:
+        rng = _rng("x", query)
+        entries = []
+        for text in synthetic_entries(self.config.tweets, seed=rng.randrange(1 << 30)):
+            rest_id = str(rng.randrange(10 ** 18, 10 ** 19))
+            author = f"bench{rng.randrange(1000)}"
+            entries.append({
+                "entryId": f"tweet-{rest_id}",
+                "content": {"itemContent": {
+                    "itemType": "TimelineTweet",
+                    "tweet_results": {"result": {
+                        "__typename": "Tweet",
+                        "rest_id": rest_id,
+                        "core": {"user_results": {"result": {"core": {"screen_name": author}}}},
+                        "legacy": {
+                            "full_text": f"{query} {' '.join(text.split()[:40])}",
+                            "created_at": self._published(rng).strftime(TWITTER_DATE_FORMAT),
+                            "favorite_count": rng.randint(0, 5000),
+                            "retweet_count": rng.randint(0, 1000),
+                            "reply_count": rng.randint(0, 300),
+                        },
+                    }},
+                }},
+            })
+        return {"data": {"search_by_raw_query": {"search_timeline": {"timeline": {
+            "instructions": [{"type": "TimelineAddEntries", "entries": entries}],
+        }}}}}
+
+    async def search_page(self, request: Request) -> HTMLResponse:
+        self.requests["x"] += 1
+        await asyncio.sleep(self.config.x_latency)
+        return HTMLResponse(_SEARCH_PAGE)
+
+    async def search_timeline(self, request: Request) -> JSONResponse:
+        await asyncio.sleep(self.config.x_latency)
+        variables = json.loads(request.query_params.get("variables", "{}"))
+        return JSONResponse(self._timeline(variables.get("rawQuery", "")))
+
+    # Stats
+
+    async def stats(self, request: Request) -> JSONResponse:
+        return JSONResponse(self.requests)
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/feeds/{name}", self.feed),
+            Route("/api/v1/access_token", self.access_token, methods=["POST"]),
+            Route("/r/{subreddit}/{listing}", self.listing),
+            Route("/r/{subreddit}/{listing}/", self.listing),
+            Route("/search", self.search_page),
+            Route("/i/api/graphql/{query_id}/SearchTimeline", self.search_timeline),
+            Route("/_stats", self.stats),
+        ])
+
+
+# Loads the timeline JSON like X's client does, then renders tweets with the
+# data-testid markup XBrowser's DOM extraction reads
+_SEARCH_PAGE = r"""<!DOCTYPE html>
+<html><head><title>Search / X</title></head>
+<body><main id="timeline"></main>
+<script>
+(async () => {
+  const q = new URLSearchParams(location.search).get('q') || '';
+  const variables = encodeURIComponent(JSON.stringify({rawQuery: q}));
+  const res = await fetch(`/i/api/graphql/bench/SearchTimeline?variables=${variables}`);
+  const payload = await res.json();
+  const instructions = payload.data.search_by_raw_query.search_timeline.timeline.instructions;
+  const main = document.getElementById('timeline');
+  if (!instructions[0].entries.length) {
+    main.innerHTML = '<div data-testid="emptyState">No results</div>';
+  }
+  for (const entry of instructions[0].entries) {
+    const tweet = entry.content.itemContent.tweet_results.result;
+    const author = tweet.core.user_results.result.core.screen_name;
+    const legacy = tweet.legacy;
+    const article = document.createElement('article');
+    article.setAttribute('data-testid', 'tweet');
+    article.innerHTML = `
+      <a role="link" href="/${author}">@${author}</a>
+      <a href="/${author}/status/${tweet.rest_id}">
+        <time datetime="${new Date(legacy.created_at).toISOString()}"></time>
+      </a>
+      <div data-testid="tweetText"></div>
+      <button data-testid="reply" aria-label="${legacy.reply_count} Replies"></button>
+      <button data-testid="retweet" aria-label="${legacy.retweet_count} reposts"></button>
+      <button data-testid="like" aria-label="${legacy.favorite_count} Likes"></button>`;
+    article.querySelector('[data-testid="tweetText"]').innerText = legacy.full_text;
+    main.appendChild(article);
+  }
+})();
+</script>
+</body></html>
+"""
+
+
+def create_app(config: FakeConfig | None = None) -> tuple[Starlette, FakeServices]:
+    services = FakeServices(config or FakeConfig())
+    return services.app(), services
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--feed-entries", type=int, default=50)
+    parser.add_argument("--tweets", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    app, _ = create_app(FakeConfig(
+        feeds=args.feeds,
+        feed_entries=args.feed_entries,
+        tweets=args.tweets,
+        rss_latency=latency,
+        reddit_latency=latency,
+        x_latency=latency,
+    ))
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
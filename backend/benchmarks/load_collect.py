@@ -0,0 +1,339 @@
+"""Load test: drive /api/collect against local stand-ins for every source.
+
+Starts ``benchmarks.fake_services`` in this process and the backend
+(``uvicorn main:app``) as a subprocess pointed at it, sends requests at a
+fixed concurrency, and reports latency percentiles, throughput, the backend's
+memory and its browser processes. Without ``--redis-url`` the backend runs
+uncached, so every request exercises the fetchers.
+
+Run from the backend directory (X.com needs Playwright's Chromium):
+
+    python -m benchmarks.load_collect --concurrency 8 --requests 200 --output before.json
+    python -m benchmarks.load_collect --concurrency 8 --requests 200 --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_services import FakeConfig, create_app
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TOPICS = ["AI", "crypto", "climate", "space", "politics"]
+
+# Metrics compared by --compare, and whether lower is better
+COMPARED = {
+    "latency_ms.p50": True,
+    "latency_ms.p95": True,
+    "latency_ms.p99": True,
+    "throughput_rps": False,
+    "memory_mb.peak": True,
+    "browsers.processes_peak": True,
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _process_tree(root: int) -> list[int]:
+    """``root`` and all its descendants, from /proc (Linux only)."""
+    children: dict[int, list[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields resume after ")"
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    tree, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def _sample_processes(root: int) -> tuple[float, int] | None:
+    """Resident memory (MB) of the process tree and its Chromium process count."""
+    if not Path("/proc").is_dir():
+        return None
+    rss_kb, browsers = 0, 0
+    for pid in _process_tree(root):
+        try:
+            status = Path(f"/proc/{pid}/status").read_text()
+            cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                rss_kb += int(line.split()[1])
+        if b"chrom" in cmdline and b"--type=" not in cmdline:
+            # Count browser processes, not their renderer/GPU helpers
+            browsers += 1
+    return rss_kb / 1024, browsers
+
+
+def _git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def _fetch_means(metrics_text: str) -> dict[str, float]:
+    """Mean fetch latency (ms) per source from the backend's /api/metrics."""
+    sums: dict[str, float] = {}
+    counts: dict[str, float] = {}
+    for line in metrics_text.splitlines():
+        for suffix, into in (("_sum", sums), ("_count", counts)):
+            prefix = f"radio_fetch_seconds{suffix}{{source=\""
+            if line.startswith(prefix):
+                source, value = line[len(prefix):].split('"} ')
+                into[source] = float(value)
+    return {
+        source: round(sums[source] / counts[source] * 1000, 1)
+        for source in sums
+        if counts.get(source)
+    }
+
+
+def _lookup(results: dict, dotted: str) -> float | None:
+    value = results
+    for part in dotted.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+async def _start_fakes(config: FakeConfig, port: int) -> tuple[uvicorn.Server, asyncio.Task, object]:
+    app, services = create_app(config)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task, services
+
+
+async def _start_backend(args, port: int, fake_url: str) -> asyncio.subprocess.Process:
+    env = {
+        **os.environ,
+        "RSS_FEEDS": ",".join(f"{fake_url}/feeds/{n}.xml" for n in range(args.feeds)),
+        "REDDIT_CLIENT_ID": "bench",
+        "REDDIT_CLIENT_SECRET": "bench",
+        "REDDIT_OAUTH_URL": fake_url,
+        "REDDIT_URL": fake_url,
+        "X_BASE_URL": fake_url,
+        "X_COOKIES_JSON": "",
+        "X_COOKIES_PATH": "/nonexistent",
+        # An unreachable Redis disables caching
+        "REDIS_URL": args.redis_url or "redis://127.0.0.1:1",
+    }
+    output = None if args.verbose else subprocess.DEVNULL
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers), "--log-level", "warning",
+        cwd=BACKEND_DIR, env=env, stdout=output, stderr=output,
+    )
+
+    async with httpx.AsyncClient() as client:
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise RuntimeError(f"Backend exited with code {process.returncode}")
+            try:
+                if (await client.get(f"http://127.0.0.1:{port}/api/health")).status_code == 200:
+                    return process
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Backend did not become healthy within 60s")
+
+
+async def run(args) -> dict:
+    fake_port, api_port = _free_port(), _free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    latency = args.latency_ms / 1000
+    fakes, fakes_task, services = await _start_fakes(
+        FakeConfig(
+            feeds=args.feeds,
+            feed_entries=args.feed_entries,
+            tweets=args.tweets,
+            rss_latency=latency,
+            reddit_latency=latency,
+            x_latency=latency,
+        ),
+        fake_port,
+    )
+    backend = await _start_backend(args, api_port, fake_url)
+
+    api = f"http://127.0.0.1:{api_port}"
+    topics = [t.strip() for t in args.topics.split(",") if t.strip()]
+    latencies: list[float] = []
+    errors = 0
+    peak_memory, peak_browsers = 0.0, 0
+
+    async def sample():
+        nonlocal peak_memory, peak_browsers
+        while True:
+            sampled = _sample_processes(backend.pid)
+            if sampled:
+                peak_memory = max(peak_memory, sampled[0])
+                peak_browsers = max(peak_browsers, sampled[1])
+            await asyncio.sleep(0.5)
+
+    try:
+        async with httpx.AsyncClient(timeout=120) as client:
+            slots = asyncio.Semaphore(args.concurrency)
+
+            async def request(i: int, record: bool):
+                nonlocal errors
+                params = {"topics": topics[i % len(topics)], "sources": args.sources}
+                async with slots:
+                    started = time.perf_counter()
+                    try:
+                        response = await client.get(f"{api}/api/collect", params=params)
+                        ok = response.status_code == 200
+                    except httpx.HTTPError:
+                        ok = False
+                    elapsed = time.perf_counter() - started
+                if record:
+                    if ok:
+                        latencies.append(elapsed)
+                    else:
+                        errors += 1
+
+            await asyncio.gather(*(request(i, False) for i in range(args.warmup)))
+
+            sampler = asyncio.create_task(sample())
+            started = time.perf_counter()
+            await asyncio.gather(*(request(i, True) for i in range(args.requests)))
+            wall = time.perf_counter() - started
+            sampler.cancel()
+
+            end_sample = _sample_processes(backend.pid)
+            health = (await client.get(f"{api}/api/health")).json()
+            metrics = (await client.get(f"{api}/api/metrics")).text
+    finally:
+        backend.terminate()
+        await backend.wait()
+        fakes.should_exit = True
+        await fakes_task
+
+    ordered = sorted(latencies)
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "params": vars(args) | {"compare": None, "output": None, "verbose": False},
+        "requests": len(latencies),
+        "errors": errors,
+        "latency_ms": {
+            "p50": round(_percentile(ordered, 50) * 1000, 1),
+            "p95": round(_percentile(ordered, 95) * 1000, 1),
+            "p99": round(_percentile(ordered, 99) * 1000, 1),
+            "max": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+        },
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "memory_mb": {
+            "peak": round(peak_memory, 1),
+            "end": round(end_sample[0], 1) if end_sample else None,
+        },
+        "browsers": {
+            "processes_peak": peak_browsers,
+            # Only reported when the backend runs a single worker
+            "pool": health.get("browser_pool"),
+        },
+        "fetch_ms_mean": _fetch_means(metrics),
+        "upstream_requests": dict(services.requests),
+    }
+
+
+def _print(results: dict, baseline: dict | None):
+    print(
+        f"commit {results['commit']}: {results['requests']} requests, "
+        f"{results['errors']} errors, concurrency {results['params']['concurrency']}"
+    )
+    for key, lower_is_better in COMPARED.items():
+        value = _lookup(results, key)
+        line = f"  {key:<24} {value!s:>10}"
+        before = _lookup(baseline, key) if baseline else None
+        if isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+            change = (value - before) / before * 100
+            verdict = "better" if (change < 0) == lower_is_better else "worse"
+            line += f"   was {before!s:>10} ({change:+.1f}%, {verdict})"
+        print(line)
+    print(f"  fetch ms (mean)          {results['fetch_ms_mean']}")
+    print(f"  upstream requests        {results['upstream_requests']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--topics", default=",".join(TOPICS))
+    parser.add_argument("--sources", default="rss,reddit,twitter")
+    parser.add_argument("--workers", type=int, default=1, help="Backend worker processes")
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--feed-entries", type=int, default=50)
+    parser.add_argument("--tweets", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Added to every fake response")
+    parser.add_argument("--redis-url", default="", help="Enable the backend's cache")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Show the backend's logs")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        ignored = {"compare": None, "output": None, "verbose": False}
+        if baseline.get("params", {}) | ignored != results["params"]:
+            print("warning: baseline was run with different parameters")
+    _print(results, baseline)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
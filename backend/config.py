@@ -11,12 +11,24 @@ class Settings(BaseSettings):
     reddit_client_id: str = ""
     reddit_client_secret: str = ""
     reddit_user_agent: str = "InteractiveRadio/1.0"
+    reddit_request_concurrency: int = 6  # Subreddit requests in flight, across all searches
+    reddit_oauth_url: str = "https://oauth.reddit.com"  # Overridden by benchmarks
+    reddit_url: str = "https://www.reddit.com"
 
     # RSS Feeds (comma-separated URLs)
     rss_feeds: str = (
         "https://feeds.bbci.co.uk/news/rss.xml,"
         "https://feeds.reuters.com/reuters/topNews"
     )
+    rss_snapshot_ttl_seconds: int = 300  # Reuse parsed feeds for this long
+    rss_feed_cache_ttl_seconds: int = 86400  # Keep validators + entries in Redis
+    rss_feed_concurrency: int = 8  # Feeds downloaded at once within one search
+
+    # Outbound HTTP (shared client, HTTP/2 with keep-alive)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_seconds: float = 30.0
+    http_max_per_host: int = 6  # Concurrent requests to any one host
 
     # Redis
     redis_url: str = "redis://localhost:6379"
@@ -24,11 +36,50 @@ class Settings(BaseSettings):
     # X.com
     x_cookies_path: str = "./x_cookies.json"
     x_cookies_json: str = ""  # JSON string of cookies (for Heroku)
+    x_capture_mode: str = "graphql"  # "graphql" (read SearchTimeline JSON) or "dom"
+    x_base_url: str = "https://x.com"  # Overridden by benchmarks
+
+    # Browser pool (shared warm Chromium contexts for X.com)
+    browser_pool_size: int = 2
+    browser_pool_idle_seconds: int = 600  # Close contexts unused for this long
+    x_browser_service_url: str = ""  # e.g. http://127.0.0.1:8001; searches X there instead
 
     # Collection
     max_items_per_source: int = 10
-    cache_ttl_seconds: int = 3600  # 1 hour
+    cache_ttl_seconds: int = 3600  # 1 hour; hard limit for serving stale results
+    cache_ttl_rss_seconds: int = 600  # Per-(topic, source) freshness
+    cache_ttl_reddit_seconds: int = 300
+    cache_ttl_twitter_seconds: int = 120
     max_feed_age_days: int = 3  # Only include news from the last N days
+    collect_deadline_seconds: float = 30.0  # Return partial results after this
+    # Topic searches running at once per source, across all requests
+    # (requests and feeds within one search are limited separately)
+    rss_topic_concurrency: int = 4
+    reddit_topic_concurrency: int = 4
+
+    # Circuit breakers (per source and per feed URL)
+    breaker_failure_rate: float = 0.5  # Open when this share of recent calls failed
+    breaker_min_calls: int = 5  # ...and at least this many calls were seen
+    breaker_window: int = 20  # Recent calls considered
+    breaker_reset_seconds: int = 60  # Wait this long before a half-open probe
+
+    # Ranking (top items per topic across sources)
+    max_items_per_topic: int = 20
+    rank_relevance_weight: float = 0.4
+    rank_engagement_weight: float = 0.3
+    rank_recency_weight: float = 0.3
+    rank_half_life_hours: float = 12.0  # Recency score halves every N hours
+    rank_window_size: int = 1000  # Recent items per source for engagement percentiles
+
+    # Compact responses (format=compact, for the voice agent's context)
+    compact_item_chars: int = 280  # Text kept per item
+    compact_topic_chars: int = 2000  # Text kept across a topic's items
+
+    # Background ingestion (serve /api/collect from pre-fetched items)
+    ingest_enabled: bool = False
+    ingest_in_process: bool = True  # False when `python -m agent.ingest` runs separately
+    ingest_interval_seconds: int = 120
+    x_watch_list: str = ""  # Comma-separated X searches to poll
 
     model_config = {"env_file": ".env"}
 
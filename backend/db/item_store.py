@@ -0,0 +1,115 @@
+import bisect
+import hashlib
+import logging
+from datetime import datetime
+
+from models.feed_item import FeedItem, NewsSource
+from utils.topic_index import TopicIndex
+from utils.topic_matcher import MatchResult
+
+logger = logging.getLogger(__name__)
+
+
+def item_id(item: FeedItem) -> str:
+    """Stable identity for an item: its URL, or a hash of source and title."""
+    if item.url:
+        return item.url
+    raw = f"{item.source.value}:{item.source_name}:{item.title}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+class ItemStore:
+    """In-memory, time-indexed store of ingested FeedItems.
+
+    Items are keyed by ``item_id`` (re-ingesting an item updates it in
+    place) and indexed per source by ``published_at`` so "latest items for
+    a source since X" is a bisect plus a slice. A ``TopicIndex`` over each
+    item's title and content answers topic queries from postings.
+    """
+
+    def __init__(self):
+        self._items: dict[str, FeedItem] = {}
+        # Per source: (published timestamp, item id), kept sorted ascending
+        self._timeline: dict[NewsSource, list[tuple[float, str]]] = {
+            source: [] for source in NewsSource
+        }
+        self.topic_index = TopicIndex()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, items: list[FeedItem]) -> int:
+        """Insert or update items. Returns how many were new."""
+        added = 0
+        for item in items:
+            key = item_id(item)
+            existing = self._items.get(key)
+            if existing is not None:
+                self._unindex(existing, key)
+            else:
+                added += 1
+            self._items[key] = item
+            published = item.published_at.timestamp()
+            bisect.insort(self._timeline[item.source], (published, key))
+            self.topic_index.add(key, f"{item.title} {item.content}", published)
+        return added
+
+    def _unindex(self, item: FeedItem, key: str):
+        index = self._timeline[item.source]
+        entry = (item.published_at.timestamp(), key)
+        pos = bisect.bisect_left(index, entry)
+        if pos < len(index) and index[pos] == entry:
+            del index[pos]
+
+    def query(
+        self,
+        source: NewsSource,
+        since: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[FeedItem]:
+        """Items from ``source`` published at or after ``since``, newest first."""
+        index = self._timeline[source]
+        start = bisect.bisect_left(index, (since.timestamp(), "")) if since else 0
+        window = index[start:]
+        if limit is not None:
+            window = window[-limit:] if limit > 0 else []
+        return [self._items[key] for _, key in reversed(window)]
+
+    async def match(
+        self,
+        topic: str,
+        sources: list[NewsSource] | None = None,
+        since: datetime | None = None,
+    ) -> list[tuple[FeedItem, MatchResult]]:
+        """Items matching ``topic`` from ``sources`` published since ``since``.
+
+        A coroutine, like ``RedisItemStore.match``, so callers can use
+        either store.
+        """
+        matches = self.topic_index.match(topic, since=since.timestamp() if since else None)
+        return [
+            (item, result)
+            for key, result in matches.items()
+            if (item := self._items[key]).source in (sources or NewsSource)
+        ]
+
+    def trim(self, before: datetime) -> int:
+        """Drop items published before ``before``. Returns how many were dropped."""
+        cutoff = before.timestamp()
+        removed = 0
+        for index in self._timeline.values():
+            pos = bisect.bisect_left(index, (cutoff, ""))
+            for _, key in index[:pos]:
+                self._items.pop(key, None)
+                self.topic_index.remove(key)
+            del index[:pos]
+            removed += pos
+        return removed
+
+    def stats(self) -> dict[str, int]:
+        """Item counts per source."""
+        return {source.value: len(index) for source, index in self._timeline.items()}
+
+
+# Process-wide item store, filled by the ingestion worker
+item_store = ItemStore()
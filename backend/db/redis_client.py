@@ -1,12 +1,38 @@
+import asyncio
 import hashlib
 import logging
+import secrets
 
 import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
 
 from config import settings
+from utils.metrics import REDIS_SECONDS
 
 logger = logging.getLogger(__name__)
 
+
+class _TimedPipeline(Pipeline):
+    """Pipeline that records the latency of each round trip as ``pipeline``."""
+
+    async def execute(self, raise_on_error: bool = True):
+        with REDIS_SECONDS.time(command="pipeline"):
+            return await super().execute(raise_on_error)
+
+
+class _TimedRedis(aioredis.Redis):
+    """Redis client that records the latency of every command and pipeline."""
+
+    async def execute_command(self, *args, **options):
+        with REDIS_SECONDS.time(command=str(args[0]).lower()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return _TimedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
 _redis: aioredis.Redis | None = None
 
 
@@ -23,7 +49,7 @@ async def init_redis() -> aioredis.Redis | None:
             import ssl
             ssl_cert_reqs = ssl.CERT_NONE
         
-        _redis = aioredis.from_url(
+        _redis = _TimedRedis.from_url(
             redis_url,
             decode_responses=True,
             socket_connect_timeout=3,
@@ -52,7 +78,113 @@ def get_redis() -> aioredis.Redis | None:
     return _redis
 
 
-def cache_key(topics: list[str], sources: list[str]) -> str:
-    """Generate a deterministic cache key for a collection request."""
-    raw = f"collect:{','.join(sorted(topics))}:{','.join(sorted(sources))}"
-    return f"ir:{hashlib.md5(raw.encode()).hexdigest()}"
+def normalize_topic(topic: str) -> str:
+    """Canonical form of a topic for cache keys ("  AI " and "ai" share one)."""
+    return " ".join(topic.lower().split())
+
+
+def cache_key(topic: str, source: str) -> str:
+    """Generate a deterministic cache key for one topic from one source."""
+    raw = f"collect:{normalize_topic(topic)}"
+    return f"ir:{source}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def response_cache_key(topics: list[str], sources: list[str], format: str) -> str:
+    """Key for a whole encoded /api/collect response.
+
+    The body is keyed by the topics exactly as sent, so unlike the per-piece
+    keys these are not normalized. Topics never contain commas (the request
+    splits on them), so joining them on commas is unambiguous.
+    """
+    topic_part = ",".join(topics)
+    raw = f"response:{topic_part}:{','.join(sorted(sources))}:{format}"
+    return f"ir:response:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def feed_cache_key(url: str) -> str:
+    """Key for a feed's persisted entries and HTTP validators."""
+    return f"ir:feed:{hashlib.md5(url.encode()).hexdigest()}"
+
+
+def item_member(item_id: str) -> str:
+    """Short, fixed-length member for an item in the item store's sorted sets."""
+    return hashlib.md5(item_id.encode()).hexdigest()
+
+
+def item_key(member: str) -> str:
+    """Hash holding one stored item."""
+    return f"ir:item:{member}"
+
+
+def source_items_key(source: str) -> str:
+    """Sorted set of a source's stored items, scored by publish time."""
+    return f"ir:items:{source}"
+
+
+def term_items_key(term: str) -> str:
+    """Sorted set of the stored items indexed under a term, scored by publish time."""
+    return f"ir:term:{term}"
+
+
+def term_vocabulary_key() -> str:
+    """Sorted set of every indexed term, all scored 0 so it orders lexically."""
+    return "ir:terms"
+
+
+# Deletes the lock only if it still holds our token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+async def acquire_lock(key: str, lease_seconds: float) -> str | None:
+    """Try to take a short-lived lock shared by all workers.
+
+    Returns a token to release it with, or None if another holder has it.
+    Without Redis there is nothing to coordinate, so the lock is granted.
+    """
+    token = secrets.token_hex(8)
+    if not _redis:
+        return token
+    try:
+        acquired = await _redis.set(
+            f"{key}:lock", token, nx=True, px=int(lease_seconds * 1000)
+        )
+    except Exception as e:
+        logger.warning("Redis lock failed (%s) — proceeding without it", e)
+        return token
+    return token if acquired else None
+
+
+async def release_lock(key: str, token: str):
+    """Release a lock taken with ``acquire_lock``."""
+    if not _redis:
+        return
+    try:
+        await _redis.eval(_RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+    except Exception as e:
+        logger.warning("Redis lock release failed: %s", e)
+
+
+async def wait_for_key(key: str, timeout: float, interval: float = 0.25) -> str | None:
+    """Poll until ``key`` has a value or its lock is released, up to ``timeout``."""
+    if not _redis:
+        return None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        try:
+            value = await _redis.get(key)
+            if value is not None:
+                return value
+            if not await _redis.exists(f"{key}:lock"):
+                # Holder finished; it may have written just before releasing
+                return await _redis.get(key)
+        except Exception as e:
+            logger.warning("Redis read failed while waiting for %s: %s", key, e)
+            return None
+        await asyncio.sleep(interval)
+    return None
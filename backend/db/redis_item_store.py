@@ -0,0 +1,265 @@
+"""Persistent item store in Redis, shared by every process.
+
+The in-memory ``ItemStore`` lives and dies with its process. This store
+keeps ingested items in Redis, so they survive restarts and can be served
+by API workers that do not ingest themselves:
+
+    ir:item:{member}     hash: source, published, data (the item's JSON)
+    ir:items:{source}    members of a source's items, scored by publish time
+    ir:term:{word}       members of the items containing a word (stopwords
+                         are not indexed), scored by publish time
+    ir:terms             every indexed word, for prefix lookups and trimming
+
+Members are ``item_member(item_id)``. Item hashes expire
+``max_feed_age_days`` after publication. ``trim`` drops older members from
+the source sets and every word set, and forgets words with no items left.
+Writes go through non-transactional pipelines, one round trip per batch of
+items, and items already stored with the same publish time only have their
+data refreshed.
+"""
+
+import logging
+import time
+from datetime import datetime
+
+from config import settings
+from db.item_store import item_id
+from db.redis_client import (
+    get_redis,
+    item_key,
+    item_member,
+    source_items_key,
+    term_items_key,
+    term_vocabulary_key,
+)
+from models.feed_item import FeedItem, NewsSource
+from utils.story_clusters import STOPWORDS
+from utils.topic_index import keyword_prefixes, tokenize
+from utils.topic_matcher import MatchResult, get_matcher
+
+logger = logging.getLogger(__name__)
+
+# Items written per pipeline round trip
+WRITE_BATCH = 200
+# Word sets trimmed per pipeline round trip
+TRIM_BATCH = 1000
+# Word sets are trimmed at most this often; reads filter by score meanwhile
+TERM_TRIM_SECONDS = 600
+# Newest members read from each word's sorted set when matching a topic
+MATCH_CANDIDATES_PER_TERM = 500
+
+
+def _retention_seconds() -> int:
+    return settings.max_feed_age_days * 24 * 60 * 60
+
+
+def _index_words(item: FeedItem) -> set[str]:
+    return set(tokenize(f"{item.title} {item.content}")) - STOPWORDS
+
+
+class RedisItemStore:
+    """Ingested items in Redis hashes, indexed by source and word over time.
+
+    Mirrors ``ItemStore``'s queries as coroutines. While Redis is
+    unavailable, writes are dropped and queries return nothing.
+    """
+
+    def __init__(self):
+        self._terms_trimmed_at = 0.0
+
+    async def add(self, items: list[FeedItem]) -> int:
+        """Insert or update items. Returns how many were new."""
+        redis = get_redis()
+        if not redis or not items:
+            return 0
+
+        retention = _retention_seconds()
+        cutoff = time.time() - retention
+        fresh = [item for item in items if item.published_at.timestamp() >= cutoff]
+        added = 0
+        try:
+            for start in range(0, len(fresh), WRITE_BATCH):
+                batch = fresh[start:start + WRITE_BATCH]
+                members = [item_member(item_id(item)) for item in batch]
+                async with redis.pipeline(transaction=False) as pipe:
+                    for member in members:
+                        pipe.hget(item_key(member), "published")
+                    stored = await pipe.execute()
+
+                words: set[str] = set()
+                async with redis.pipeline(transaction=False) as pipe:
+                    for item, member, stored_published in zip(batch, members, stored):
+                        key = item_key(member)
+                        published = item.published_at.timestamp()
+                        if stored_published is not None and float(stored_published) == published:
+                            # Already indexed; only engagement and text may have changed
+                            pipe.hset(key, "data", item.model_dump_json())
+                            continue
+                        if stored_published is None:
+                            added += 1
+                        pipe.hset(key, mapping={
+                            "source": item.source.value,
+                            "published": published,
+                            "data": item.model_dump_json(),
+                        })
+                        pipe.expireat(key, int(published + retention))
+                        pipe.zadd(source_items_key(item.source.value), {member: published})
+                        for word in _index_words(item):
+                            pipe.zadd(term_items_key(word), {member: published})
+                            words.add(word)
+                    if words:
+                        pipe.zadd(term_vocabulary_key(), dict.fromkeys(words, 0))
+                    await pipe.execute()
+        except Exception as e:
+            logger.warning("Redis item store write failed: %s", e)
+        return added
+
+    async def _load(self, members: list[str]) -> list[FeedItem]:
+        """Items for the given members, in order, skipping expired ones."""
+        redis = get_redis()
+        if not redis or not members:
+            return []
+        async with redis.pipeline(transaction=False) as pipe:
+            for member in members:
+                pipe.hget(item_key(member), "data")
+            payloads = await pipe.execute()
+        return [FeedItem.model_validate_json(data) for data in payloads if data]
+
+    async def query(
+        self,
+        source: NewsSource,
+        since: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[FeedItem]:
+        """Items from ``source`` published at or after ``since``, newest first."""
+        redis = get_redis()
+        if not redis or (limit is not None and limit <= 0):
+            return []
+        try:
+            members = await redis.zrevrangebyscore(
+                source_items_key(source.value),
+                "+inf",
+                since.timestamp() if since else "-inf",
+                start=0 if limit is not None else None,
+                num=limit,
+            )
+            return await self._load(members)
+        except Exception as e:
+            logger.warning("Redis item store read failed: %s", e)
+            return []
+
+    async def load(self, since: datetime | None = None) -> list[FeedItem]:
+        """Every stored item published at or after ``since``, newest first per source."""
+        items: list[FeedItem] = []
+        for source in NewsSource:
+            items.extend(await self.query(source, since=since))
+        return items
+
+    async def match(
+        self,
+        topic: str,
+        sources: list[NewsSource] | None = None,
+        since: datetime | None = None,
+    ) -> list[tuple[FeedItem, MatchResult]]:
+        """Items matching ``topic`` from ``sources`` published since ``since``.
+
+        Words starting with the topic's keyword prefixes are found in the
+        vocabulary, the newest members of their sets are loaded, and each
+        item is scored with the topic's ``TopicMatcher``, as in the
+        in-memory store.
+        """
+        redis = get_redis()
+        if not redis:
+            return []
+
+        cutoff = time.time() - _retention_seconds()
+        min_score = max(cutoff, since.timestamp()) if since else cutoff
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for prefix in keyword_prefixes(topic, STOPWORDS):
+                    pipe.zrangebylex(term_vocabulary_key(), f"[{prefix}", f"[{prefix}\xff")
+                words = {word for found in await pipe.execute() for word in found}
+
+            async with redis.pipeline(transaction=False) as pipe:
+                for word in sorted(words):
+                    pipe.zrevrangebyscore(
+                        term_items_key(word), "+inf", min_score,
+                        start=0, num=MATCH_CANDIDATES_PER_TERM,
+                    )
+                found = await pipe.execute() if words else []
+            members = list(dict.fromkeys(m for batch in found for m in batch))
+            items = await self._load(members)
+        except Exception as e:
+            logger.warning("Redis item store read failed: %s", e)
+            return []
+
+        wanted = sources or list(NewsSource)
+        matcher = get_matcher(topic)
+        matches: list[tuple[FeedItem, MatchResult]] = []
+        for item in items:
+            if item.source not in wanted:
+                continue
+            result = matcher.match(f"{item.title} {item.content}")
+            if result.matched:
+                matches.append((item, result))
+        return matches
+
+    async def trim(self, before: datetime) -> int:
+        """Drop items published before ``before`` from the sorted sets.
+
+        Source sets are trimmed on every call; word sets at most every
+        ``TERM_TRIM_SECONDS``, walking the vocabulary and forgetting words
+        whose sets became empty. Item hashes expire on their own. Returns
+        how many items were dropped from the source sets.
+        """
+        redis = get_redis()
+        if not redis:
+            return 0
+        max_score = f"({before.timestamp()}"
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for source in NewsSource:
+                    pipe.zremrangebyscore(source_items_key(source.value), "-inf", max_score)
+                removed = sum(await pipe.execute())
+
+            if time.monotonic() - self._terms_trimmed_at >= TERM_TRIM_SECONDS:
+                self._terms_trimmed_at = time.monotonic()
+                await self._trim_terms(max_score)
+        except Exception as e:
+            logger.warning("Redis item store trim failed: %s", e)
+            return 0
+        return removed
+
+    async def _trim_terms(self, max_score: str):
+        redis = get_redis()
+        emptied: list[str] = []
+        start = 0
+        while words := await redis.zrange(term_vocabulary_key(), start, start + TRIM_BATCH - 1):
+            async with redis.pipeline(transaction=False) as pipe:
+                for word in words:
+                    pipe.zremrangebyscore(term_items_key(word), "-inf", max_score)
+                    pipe.exists(term_items_key(word))
+                replies = await pipe.execute()
+            emptied.extend(word for word, exists in zip(words, replies[1::2]) if not exists)
+            start += TRIM_BATCH
+        for i in range(0, len(emptied), TRIM_BATCH):
+            await redis.zrem(term_vocabulary_key(), *emptied[i:i + TRIM_BATCH])
+
+    async def stats(self) -> dict[str, int]:
+        """Item counts per source."""
+        redis = get_redis()
+        if not redis:
+            return {}
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for source in NewsSource:
+                    pipe.zcard(source_items_key(source.value))
+                counts = await pipe.execute()
+        except Exception as e:
+            logger.warning("Redis item store read failed: %s", e)
+            return {}
+        return {source.value: count for source, count in zip(NewsSource, counts)}
+
+
+# Process-wide handle on the shared store
+redis_item_store = RedisItemStore()
@@ -3,10 +3,21 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from agent.browsers.browser_pool import init_browser_pool, close_browser_pool
+from agent.fetchers.http_client import init_http_client, close_http_client
+from agent.fetchers.reddit_fetcher import init_reddit, close_reddit
+from agent.ingest import start_ingestion, stop_ingestion
 from config import settings
 from db.redis_client import init_redis, close_redis
-from routers import collect, health
+from routers import collect, health, metrics
+from utils.json_response import ORJSONResponse
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # Brotli is optional; gzip is always available
+    BrotliMiddleware = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,12 +29,27 @@ logging.basicConfig(
 async def lifespan(app: FastAPI):
     # Startup
     await init_redis()
+    await init_http_client()
+    # With a browser service, Chromium runs there instead of in every worker
+    if not settings.x_browser_service_url:
+        await init_browser_pool()
+    await init_reddit()
+    if settings.ingest_enabled and settings.ingest_in_process:
+        await start_ingestion()
     yield
     # Shutdown
+    await stop_ingestion()
+    await close_reddit()
+    await close_browser_pool()
+    await close_http_client()
     await close_redis()
 
 
-app = FastAPI(title="Interactive Radio API", lifespan=lifespan)
+app = FastAPI(
+    title="Interactive Radio API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,5 +59,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses for clients that accept it (Brotli falls back to gzip)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=1000, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 app.include_router(health.router)
 app.include_router(collect.router)
+app.include_router(metrics.router)
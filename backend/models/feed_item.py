@@ -10,6 +10,13 @@ class NewsSource(str, Enum):
     REDDIT = "reddit"
 
 
+class RelatedSource(BaseModel):
+    """Another source reporting the same story as a FeedItem."""
+    source: NewsSource
+    source_name: str
+    url: str | None = None
+
+
 class FeedItem(BaseModel):
     title: str
     content: str
@@ -19,3 +26,4 @@ class FeedItem(BaseModel):
     author: str | None = None
     published_at: datetime
     engagement: int = 0  # likes, upvotes, retweets, etc.
+    related: list[RelatedSource] = []  # other sources covering the same story
@@ -1,10 +1,30 @@
-import json
+import asyncio
 import logging
+import time
+from typing import AsyncIterator, Awaitable, Callable, Literal
 
+import orjson
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import StreamingResponse
 
-from agent.collector import NewsCollector
-from db.redis_client import get_redis, cache_key
+from agent.collector import NewsCollector, merge_items
+from agent.ingest import get_ingestion_worker
+from config import settings
+from db.item_store import ItemStore, item_store
+from db.redis_item_store import RedisItemStore, redis_item_store
+from db.redis_client import (
+    get_redis,
+    cache_key,
+    response_cache_key,
+    acquire_lock,
+    release_lock,
+    wait_for_key,
+)
+from models.feed_item import FeedItem
+from utils.compact import compact_topic
+from utils.json_response import ORJSONResponse, RawJSONResponse
+from utils.metrics import CACHE_REQUESTS, RESPONSE_CACHE_REQUESTS
+from utils.single_flight import SingleFlight
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -12,20 +32,36 @@ logger = logging.getLogger(__name__)
 VALID_SOURCES = {"rss", "twitter", "reddit"}
 MAX_TOPICS = 10
 MAX_TOPIC_LENGTH = 100
+# Lock lease beyond the collection deadline, for caching and cleanup
+COLLECT_LOCK_MARGIN_SECONDS = 5
 
+# Per-source freshness: feeds change slowly, X quickly. Pieces older than
+# this are served stale (up to cache_ttl_seconds) and refreshed in the
+# background.
+SOURCE_CACHE_TTLS = {
+    "rss": settings.cache_ttl_rss_seconds,
+    "reddit": settings.cache_ttl_reddit_seconds,
+    "twitter": settings.cache_ttl_twitter_seconds,
+}
+
+_inflight = SingleFlight()
 
-@router.get("/api/collect")
-async def collect_news(
-    topics: str = Query(..., description="Comma-separated topics"),
-    sources: str = Query(
-        "rss,twitter,reddit",
-        description="Comma-separated enabled sources: rss, twitter, reddit",
-    ),
-):
-    """Collect news for given topics from enabled sources.
 
-    Supports caching — returns cached results if available and fresh.
+def _ingested_store() -> ItemStore | RedisItemStore | None:
+    """The store to answer from when ingestion is on, or None to fetch live.
+
+    A worker that ingests reads its own in-memory store; with a separate
+    ingestion process, workers read the shared Redis store.
     """
+    if get_ingestion_worker() is not None:
+        return item_store
+    if settings.ingest_enabled and get_redis() is not None:
+        return redis_item_store
+    return None
+
+
+def _parse_request(topics: str, sources: str) -> tuple[list[str], list[str]]:
+    """Validate and split the comma-separated topics and sources."""
     # Validate and parse topics
     topic_list = [t.strip() for t in topics.split(",") if t.strip()]
     if not topic_list:
@@ -56,22 +92,369 @@ async def collect_news(
     if not source_list:
         raise HTTPException(status_code=400, detail="At least one source must be enabled")
 
-    # Check cache first
+    return topic_list, source_list
+
+
+@router.get("/api/collect")
+async def collect_news(
+    topics: str = Query(..., description="Comma-separated topics"),
+    sources: str = Query(
+        "rss,twitter,reddit",
+        description="Comma-separated enabled sources: rss, twitter, reddit",
+    ),
+    live: bool = Query(
+        False,
+        description="Fetch live from sources even when background ingestion is running",
+    ),
+    format: Literal["full", "compact"] = Query(
+        "full",
+        description="full items, or compact: short keys and truncated text",
+    ),
+):
+    """Collect news for given topics from enabled sources.
+
+    When background ingestion is running, answers from the ingested item
+    store unless ``live`` is set. Otherwise fetches live, with caching —
+    returns cached results if available and fresh. A response built only
+    from fresh pieces is cached whole and sent as is to identical requests.
+    """
+    topic_list, source_list = _parse_request(topics, sources)
+
+    # Serve from ingested items when available
+    store = None if live else _ingested_store()
+    if store is not None:
+        results = await NewsCollector(enabled_sources=source_list).collect_from_store(
+            topic_list, store
+        )
+        return ORJSONResponse(_format_results(results, format))
+
+    key = response_cache_key(topic_list, source_list, format)
+    cached = await _read_cached_response(key)
+    if cached is not None:
+        return RawJSONResponse(cached)
+
+    pieces, fetched_at = await _get_pieces(
+        [(topic, source) for topic in topic_list for source in source_list]
+    )
+
+    results: dict[str, list[dict]] = {}
+    for topic in topic_list:
+        items = [
+            FeedItem.model_validate(item)
+            for source in source_list
+            for item in pieces[(topic, source)]
+        ]
+        results[topic] = merge_items(items, topic)
+
+    body = orjson.dumps(_format_results(results, format))
+    # The response is cached until its first piece goes stale, so a hit
+    # never serves data a piece read would have refreshed. Empty pieces may
+    # be fetches that missed the deadline and are not cached at all.
+    now = time.time()
+    ttl = min(
+        SOURCE_CACHE_TTLS[source] - (now - fetched_at[(topic, source)])
+        for topic, source in pieces
+    )
+    if ttl >= 1 and all(pieces.values()):
+        await _cache_response(key, body, int(ttl))
+    return RawJSONResponse(body)
+
+
+def _format_results(
+    results: dict[str, list[dict]], format: Literal["full", "compact"]
+) -> dict[str, list[dict]]:
+    if format == "compact":
+        return {
+            topic: compact_topic(
+                items, settings.compact_item_chars, settings.compact_topic_chars
+            )
+            for topic, items in results.items()
+        }
+    return results
+
+
+async def _read_cached_response(key: str) -> str | None:
+    """An identical request's encoded response, if still cached."""
     redis = get_redis()
+    cached = None
     if redis:
-        key = cache_key(topic_list, source_list)
         try:
             cached = await redis.get(key)
-            if cached:
-                logger.info("Cache hit for topics=%s sources=%s", topic_list, source_list)
-                return json.loads(cached)
         except Exception as e:
-            logger.warning("Redis cache read failed: %s", e)
+            logger.warning("Redis response cache read failed: %s", e)
+    RESPONSE_CACHE_REQUESTS.inc(result="hit" if cached is not None else "miss")
+    return cached
+
+
+async def _cache_response(key: str, body: bytes, ttl: int):
+    redis = get_redis()
+    if not redis:
+        return
+    try:
+        await redis.set(key, body, ex=ttl)
+    except Exception as e:
+        logger.warning("Redis response cache write failed: %s", e)
+
+
+@router.get("/api/collect/stream")
+async def collect_news_stream(
+    topics: str = Query(..., description="Comma-separated topics"),
+    sources: str = Query(
+        "rss,twitter,reddit",
+        description="Comma-separated enabled sources: rss, twitter, reddit",
+    ),
+    live: bool = Query(
+        False,
+        description="Fetch live from sources even when background ingestion is running",
+    ),
+    format: Literal["ndjson", "sse"] = Query(
+        "ndjson", description="Stream format: ndjson or sse (Server-Sent Events)"
+    ),
+):
+    """Stream news for given topics as each (topic, source) batch is ready.
+
+    Each batch is ``{"topic", "source", "items"}`` (or ``"error"`` instead
+    of ``"items"``). Cached batches are sent first, then the rest as their
+    source finishes. The stream ends with ``{"done": true}``.
+    """
+    topic_list, source_list = _parse_request(topics, sources)
+    encode = _sse_event if format == "sse" else _ndjson_line
+
+    async def batches() -> AsyncIterator[bytes]:
+        async for batch in _iter_batches(topic_list, source_list, live):
+            yield encode(batch)
+        yield encode({"done": True})
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        batches(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _iter_batches(
+    topic_list: list[str], source_list: list[str], live: bool
+) -> AsyncIterator[dict]:
+    """Yield one batch per (topic, source) in the order they become ready."""
+    store = None if live else _ingested_store()
+    if store is not None:
+        results = await NewsCollector(enabled_sources=source_list).collect_from_store(
+            topic_list, store
+        )
+        for topic in topic_list:
+            for source in source_list:
+                items = [item for item in results[topic] if item["source"] == source]
+                yield {"topic": topic, "source": source, "items": items}
+        return
+
+    pairs = [(topic, source) for topic in topic_list for source in source_list]
+    cached, _ = await _read_cached(pairs)
+    for (topic, source), items in cached.items():
+        yield {"topic": topic, "source": source, "items": items}
+
+    async def fetch(topic: str, source: str, piece: Awaitable[list[dict]]) -> dict:
+        try:
+            items = await piece
+        except HTTPException as e:
+            return {"topic": topic, "source": source, "error": e.detail}
+        return {"topic": topic, "source": source, "items": items}
+
+    missing = _fetch_pieces([pair for pair in pairs if pair not in cached])
+    fetches = [fetch(*pair, piece) for pair, piece in missing.items()]
+    for next_batch in asyncio.as_completed(fetches):
+        yield await next_batch
+
+
+def _ndjson_line(data: dict) -> bytes:
+    return orjson.dumps(data) + b"\n"
+
+
+def _sse_event(data: dict) -> bytes:
+    event = b"done" if data.get("done") else b"batch"
+    return b"event: " + event + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def _encode_piece(items: list[dict]) -> bytes:
+    return orjson.dumps({"fetched_at": time.time(), "items": items})
+
+
+def _decode_piece(cached: str) -> tuple[list[dict], float]:
+    """Items of a cached piece and when they were fetched (epoch seconds)."""
+    piece = orjson.loads(cached)
+    return piece["items"], piece["fetched_at"]
+
+
+async def _read_cached(
+    pairs: list[tuple[str, str]]
+) -> tuple[dict[tuple[str, str], list[dict]], dict[tuple[str, str], float]]:
+    """Cached items for each (topic, source) that has them, and when each was fetched.
+
+    Cached pieces are fresh for their source's TTL, then served stale until
+    ``cache_ttl_seconds`` while a background refresh (one per key) replaces
+    them.
+    """
+    pieces: dict[tuple[str, str], list[dict]] = {}
+    fetched: dict[tuple[str, str], float] = {}
+    stale = 0
+
+    redis = get_redis()
+    if not redis:
+        CACHE_REQUESTS.inc(len(pairs), result="miss")
+        return pieces, fetched
+
+    keys = [cache_key(topic, source) for topic, source in pairs]
+    try:
+        for (topic, source), key, cached in zip(pairs, keys, await redis.mget(keys)):
+            if not cached:
+                continue
+            items, fetched_at = _decode_piece(cached)
+            pieces[(topic, source)] = items
+            fetched[(topic, source)] = fetched_at
+            if time.time() - fetched_at >= SOURCE_CACHE_TTLS[source]:
+                stale += 1
+                _inflight.spawn(
+                    key,
+                    lambda topic=topic, source=source: _collect_piece(
+                        topic, source, refresh=True
+                    ),
+                )
+    except Exception as e:
+        logger.warning("Redis cache read failed: %s", e)
+
+    CACHE_REQUESTS.inc(len(pieces) - stale, result="hit")
+    CACHE_REQUESTS.inc(stale, result="stale")
+    CACHE_REQUESTS.inc(len(pairs) - len(pieces), result="miss")
+
+    if pieces:
+        logger.info(
+            "Cache hit for %d/%d (topic, source) pieces, %d stale",
+            len(pieces), len(pairs), stale,
+        )
+    return pieces, fetched
+
+
+def _fetch_pieces(
+    pairs: list[tuple[str, str]]
+) -> dict[tuple[str, str], Awaitable[list[dict]]]:
+    """Start collecting uncached pieces; one awaitable of items per piece.
+
+    Identical concurrent requests share one collection per piece. RSS
+    pieces not already being collected are collected together, so their
+    topics are matched in one pass over one snapshot of the feeds.
+    """
+    rss = [
+        pair for pair in pairs
+        if pair[1] == "rss" and cache_key(*pair) not in _inflight
+    ]
+    batch = asyncio.create_task(_collect_pieces(rss)) if len(rss) > 1 else None
+
+    def collect(topic: str, source: str) -> Callable[[], Awaitable[list[dict]]]:
+        if batch is not None and (topic, source) in rss:
+            return lambda: _piece_of(batch, (topic, source))
+        return lambda: _collect_piece(topic, source)
+
+    return {
+        pair: _inflight.do(cache_key(*pair), collect(*pair))
+        for pair in pairs
+    }
+
+
+async def _piece_of(batch: asyncio.Task, pair: tuple[str, str]) -> list[dict]:
+    return (await batch)[pair]
+
+
+async def _get_pieces(
+    pairs: list[tuple[str, str]]
+) -> tuple[dict[tuple[str, str], list[dict]], dict[tuple[str, str], float]]:
+    """Items for each (topic, source), collecting only those not cached.
+
+    Also returns when each piece was fetched (epoch seconds).
+    """
+    # Check cache first
+    pieces, fetched_at = await _read_cached(pairs)
+
+    missing = [pair for pair in pairs if pair not in pieces]
+    collected = await asyncio.gather(*_fetch_pieces(missing).values())
+    pieces.update(zip(missing, collected))
+    now = time.time()
+    fetched_at.update((pair, now) for pair in missing)
+
+    return pieces, fetched_at
+
+
+async def _collect_piece(topic: str, source: str, refresh: bool = False) -> list[dict]:
+    """Collect and cache one piece; see ``_collect_pieces``."""
+    return (await _collect_pieces([(topic, source)], refresh))[(topic, source)]
+
+
+async def _collect_pieces(
+    pairs: list[tuple[str, str]], refresh: bool = False
+) -> dict[tuple[str, str], list[dict]]:
+    """Collect and cache pieces, coordinating with other workers via locks.
+
+    Pieces whose lock this worker takes are collected together in one
+    ``collect_pairs`` call. For a piece whose lock another worker already
+    holds, wait for it to write the cache instead of collecting again (or,
+    for a background ``refresh``, leave the refresh to it). Waiting and
+    collecting together stay within one ``collect_deadline_seconds``;
+    pieces not ready by then are empty.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.collect_deadline_seconds
+    lease = settings.collect_deadline_seconds + COLLECT_LOCK_MARGIN_SECONDS
+    keys = {pair: cache_key(*pair) for pair in pairs}
+    tokens = dict(zip(pairs, await asyncio.gather(
+        *(acquire_lock(keys[pair], lease) for pair in pairs)
+    )))
+
+    async def collect_locked(locked: list[tuple[str, str]]) -> dict:
+        try:
+            return await _collect_and_cache(locked, deadline)
+        finally:
+            for pair in locked:
+                if tokens[pair]:
+                    await release_lock(keys[pair], tokens[pair])
+
+    async def wait(pair: tuple[str, str]) -> list[dict]:
+        cached = await wait_for_key(keys[pair], timeout=deadline - loop.time())
+        if cached:
+            logger.info("Shared result for topic=%s source=%s", *pair)
+            return _decode_piece(cached)[0]
+        if deadline - loop.time() <= 0:
+            return []
+        # Holder failed or expired — collect ourselves in the time left
+        tokens[pair] = await acquire_lock(keys[pair], lease)
+        return (await collect_locked([pair])).get(pair, [])
+
+    locked = [pair for pair in pairs if tokens[pair]]
+    held = [] if refresh else [pair for pair in pairs if not tokens[pair]]
+    collected, *waited = await asyncio.gather(
+        collect_locked(locked), *(wait(pair) for pair in held)
+    )
+
+    pieces: dict[tuple[str, str], list[dict]] = {pair: [] for pair in pairs}
+    pieces.update(collected)
+    pieces.update(zip(held, waited))
+    return pieces
+
+
+async def _collect_and_cache(
+    pairs: list[tuple[str, str]], deadline: float
+) -> dict[tuple[str, str], list[dict]]:
+    """Collect pieces in the time left before ``deadline`` and cache them.
+
+    Pieces that missed the deadline or failed are absent from the result
+    and not cached.
+    """
+    if not pairs:
+        return {}
 
     # Collect from sources
-    collector = NewsCollector(enabled_sources=source_list)
+    collector = NewsCollector(enabled_sources=sorted({source for _, source in pairs}))
+    collector.deadline = deadline - asyncio.get_running_loop().time()
     try:
-        results = await collector.collect(topic_list)
+        fetched = await collector.collect_pairs(pairs)
     except Exception as e:
         logger.error("Collection failed: %s", e)
         raise HTTPException(
@@ -81,12 +464,24 @@ async def collect_news(
     finally:
         await collector.close()
 
-    # Cache the results
-    if redis:
-        key = cache_key(topic_list, source_list)
+    pieces = {
+        pair: [item.model_dump(mode="json") for item in items]
+        for pair, items in fetched.items()
+    }
+
+    # Cache the results, kept past their TTL for stale serving
+    redis = get_redis()
+    if redis and pieces:
         try:
-            await redis.set(key, json.dumps(results), ex=300)  # 5 min TTL
+            async with redis.pipeline(transaction=False) as pipe:
+                for (topic, source), items in pieces.items():
+                    pipe.set(
+                        cache_key(topic, source),
+                        _encode_piece(items),
+                        ex=max(settings.cache_ttl_seconds, SOURCE_CACHE_TTLS[source]),
+                    )
+                await pipe.execute()
         except Exception as e:
             logger.warning("Redis cache write failed: %s", e)
 
-    return results
+    return pieces
@@ -3,8 +3,10 @@ import logging
 
 from fastapi import APIRouter
 
+from agent.browsers.browser_pool import get_browser_pool
 from config import settings
 from db.redis_client import get_redis
+from utils.circuit_breaker import breaker_stats
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -22,6 +24,8 @@ async def health_check():
         except Exception:
             pass
 
+    pool = get_browser_pool()
+
     return {
         "status": "ok",
         "services": {
@@ -30,4 +34,6 @@ async def health_check():
             "reddit": bool(settings.reddit_client_id and settings.reddit_client_secret),
             "twitter": bool(settings.x_cookies_json or os.path.exists(settings.x_cookies_path)),
         },
+        "browser_pool": pool.stats() if pool else None,
+        "circuits": breaker_stats(),
     }
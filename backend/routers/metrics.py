@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from utils.metrics import REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Process metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
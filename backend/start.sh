@@ -0,0 +1,38 @@
+#!/bin/sh
+# Multi-worker mode: one browser service process owns Chromium, and the
+# stateless API workers (WEB_CONCURRENCY, default 4) send X.com searches to it.
+set -e
+
+BROWSER_SERVICE_PORT="${BROWSER_SERVICE_PORT:-8001}"
+export X_BROWSER_SERVICE_URL="http://127.0.0.1:$BROWSER_SERVICE_PORT"
+
+# Restart the browser service whenever it exits
+(
+  while true; do
+    python -m agent.browsers.browser_service --host 127.0.0.1 --port "$BROWSER_SERVICE_PORT" || true
+    echo "Browser service exited; restarting in 2s" >&2
+    sleep 2
+  done
+) &
+
+# Wait until it answers /health (Chromium is up) before taking traffic. If it
+# never does, start anyway: X searches then return nothing until it recovers.
+waited=0
+until python -c 'import sys, urllib.request; urllib.request.urlopen(sys.argv[1], timeout=2)' \
+    "$X_BROWSER_SERVICE_URL/health" 2>/dev/null; do
+  waited=$((waited + 1))
+  if [ "$waited" -ge "${BROWSER_SERVICE_WAIT_SECONDS:-30}" ]; then
+    echo "Browser service not ready after ${waited}s; starting the API anyway" >&2
+    break
+  fi
+  sleep 1
+done
+
+# With ingestion on, one process ingests into Redis and the workers read it
+case "$INGEST_ENABLED" in
+  1|true|True|TRUE)
+    export INGEST_IN_PROCESS=false
+    python -m agent.ingest &
+    ;;
+esac
+exec uvicorn main:app --host 0.0.0.0 --port "${PORT:-8000}" --workers "${WEB_CONCURRENCY:-4}"
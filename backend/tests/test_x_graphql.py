@@ -0,0 +1,100 @@
+import copy
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from agent.browsers.x_graphql import (
+    count_timeline_tweets,
+    is_search_timeline,
+    parse_search_timeline,
+)
+from models.feed_item import NewsSource
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def payload() -> dict:
+    return json.loads((FIXTURES / "search_timeline.json").read_text())
+
+
+def test_parses_organic_tweets_in_timeline_order(payload):
+    items = parse_search_timeline(payload)
+
+    assert [item.url for item in items] == [
+        "https://x.com/spacenews/status/1846000000000000001",
+        "https://x.com/astro_daily/status/1846000000000000003",
+        "https://x.com/nasa_watch/status/1846000000000000004",
+        "https://x.com/orbit_lab/status/1846000000000000007",
+    ]
+    assert all(item.source == NewsSource.TWITTER for item in items)
+
+
+def test_reads_exact_timestamps_and_engagement(payload):
+    first = parse_search_timeline(payload)[0]
+
+    assert first.published_at == datetime(2026, 10, 16, 14, 5, tzinfo=timezone.utc)
+    assert first.engagement == 1500 + 230 + 45
+    assert first.author == "spacenews"
+    assert first.source_name == "@spacenews"
+    assert first.content == "SpaceX launches 22 Starlink satellites from Cape Canaveral"
+
+
+def test_unwraps_visibility_results_and_legacy_user_schema(payload):
+    item = parse_search_timeline(payload)[1]
+
+    assert item.author == "astro_daily"
+    assert item.engagement == 820 + 96 + 31
+
+
+def test_prefers_note_tweet_text_for_long_posts(payload):
+    item = parse_search_timeline(payload)[2]
+
+    assert len(item.content) > 280
+    assert not item.content.endswith("…")
+    assert item.title.endswith("...")
+
+
+def test_skips_promoted_tombstones_and_cursors(payload):
+    authors = {item.author for item in parse_search_timeline(payload)}
+
+    assert "brand" not in authors
+    assert "brand2" not in authors
+    # Tombstone and both conversation-module tweets count; promoted ones do not
+    assert count_timeline_tweets(payload) == 6
+
+
+def _drop_tweet_legacy(node):
+    """Remove ``legacy`` from every Tweet object, as a schema change might."""
+    if isinstance(node, dict):
+        if node.get("__typename") == "Tweet":
+            node.pop("legacy", None)
+        for value in node.values():
+            _drop_tweet_legacy(value)
+    elif isinstance(node, list):
+        for value in node:
+            _drop_tweet_legacy(value)
+
+
+def test_schema_change_is_detectable(payload):
+    changed = copy.deepcopy(payload)
+    _drop_tweet_legacy(changed)
+
+    assert parse_search_timeline(changed) == []
+    assert count_timeline_tweets(changed) == 6
+
+
+def test_empty_results_have_no_tweets():
+    payload = {"data": {"search_by_raw_query": {"search_timeline": {"timeline": {
+        "instructions": [{"type": "TimelineAddEntries", "entries": []}],
+    }}}}}
+
+    assert parse_search_timeline(payload) == []
+    assert count_timeline_tweets(payload) == 0
+
+
+def test_is_search_timeline():
+    assert is_search_timeline("https://x.com/i/api/graphql/abc123/SearchTimeline?variables=%7B%7D")
+    assert not is_search_timeline("https://x.com/i/api/graphql/abc123/HomeTimeline")
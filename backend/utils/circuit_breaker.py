@@ -0,0 +1,172 @@
+"""Circuit breakers and adaptive timeouts for upstream sources.
+
+A breaker tracks the outcome of recent calls to one upstream (a source, or
+a single feed URL). When too many of them fail it opens, and callers skip
+the upstream instead of waiting for it to time out again. After a cool-down
+one half-open probe is let through; its success closes the breaker, its
+failure re-opens it.
+
+Adaptive timeouts replace fixed constants with a multiple of the observed
+p95 latency of successful calls, bounded by a floor and the old constant.
+"""
+
+import logging
+import math
+import time
+from collections import deque
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is skipped because its circuit is open."""
+
+
+class AdaptiveTimeout:
+    """A timeout derived from the latency of recent successful calls."""
+
+    def __init__(
+        self,
+        default: float,
+        floor: float,
+        ceiling: float | None = None,
+        percentile: float = 0.95,
+        factor: float = 1.5,
+        window: int = 50,
+        min_samples: int = 10,
+    ):
+        self.default = default
+        self.floor = floor
+        self.ceiling = ceiling if ceiling is not None else default
+        self.percentile = percentile
+        self.factor = factor
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float):
+        self._latencies.append(seconds)
+
+    def latency(self) -> float | None:
+        """The configured percentile of recent latencies, if enough were seen."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)]
+
+    def current(self) -> float:
+        """The timeout to use for the next call, in seconds."""
+        latency = self.latency()
+        if latency is None:
+            return self.default
+        return min(self.ceiling, max(self.floor, latency * self.factor))
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a window of recent call outcomes."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float | None = None,
+        min_calls: int | None = None,
+        window: int | None = None,
+        reset_seconds: float | None = None,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate if failure_rate is not None else settings.breaker_failure_rate
+        self.min_calls = min_calls if min_calls is not None else settings.breaker_min_calls
+        self.reset_seconds = (
+            reset_seconds if reset_seconds is not None else settings.breaker_reset_seconds
+        )
+        self._outcomes: deque[bool] = deque(
+            maxlen=window if window is not None else settings.breaker_window
+        )
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now.
+
+        While half-open, only one probe is let through at a time; a probe
+        that never reports back is replaced after ``reset_seconds``.
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+
+        now = time.monotonic()
+        if self._probe_started is not None and now - self._probe_started < self.reset_seconds:
+            return False
+        self._state = HALF_OPEN
+        self._probe_started = now
+        return True
+
+    def record_success(self):
+        if self._state != CLOSED:
+            logger.info("Circuit %s closed", self.name)
+            self._outcomes.clear()
+        self._state = CLOSED
+        self._probe_started = None
+        self._outcomes.append(True)
+
+    def record_failure(self):
+        if self._state != CLOSED:
+            # The half-open probe failed
+            self._open()
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_rate
+        ):
+            self._open()
+
+    def _open(self):
+        if self._state == CLOSED:
+            logger.warning(
+                "Circuit %s opened after %d/%d failed calls",
+                self.name, self._outcomes.count(False), len(self._outcomes),
+            )
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+
+    def stats(self) -> dict:
+        calls = len(self._outcomes)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "failure_rate": round(self._outcomes.count(False) / calls, 2) if calls else 0.0,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """The process-wide breaker for ``name``, created on first use."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
+
+
+def breaker_stats() -> dict[str, dict]:
+    """State of every breaker, for the health endpoint."""
+    return {name: breaker.stats() for name, breaker in sorted(_breakers.items())}
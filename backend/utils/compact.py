@@ -0,0 +1,105 @@
+"""Compact serialization of collected items for the voice agent's context.
+
+Full items repeat themselves (an X post's title is a prefix of its text, a
+Reddit link post's text starts with its title) and carry summaries of any
+length. The compact form uses one-letter keys, drops fields that can be
+derived from others, strips markup and truncates text to a budget per item
+and per topic:
+
+    t  title (omitted for X, whose title is derived from the text)
+    c  text, truncated; omitted when it only repeats the title
+    u  url
+    s  source
+    n  source name
+    a  author, when not already the source name
+    p  published_at
+    e  engagement, when non-zero
+    r  related sources, as {"s", "n", "u"}
+"""
+
+import html
+import re
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_REDDIT_LINK_RE = re.compile(r"\n\nLink: \S+$")
+
+ELLIPSIS = "…"
+
+
+def clean_text(text: str) -> str:
+    """Plain text with HTML tags and entities removed and whitespace collapsed."""
+    return _WHITESPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", text))).strip()
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cut ``text`` to at most ``limit`` characters, at a word boundary if possible."""
+    if len(text) <= limit:
+        return text
+    if limit <= len(ELLIPSIS):
+        return ""
+    cut = text[: limit - len(ELLIPSIS)]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,.;:-") + ELLIPSIS
+
+
+def _body(item: dict) -> str:
+    """The item's text without what the title or other fields already say."""
+    content = item["content"]
+    if item["source"] == "reddit":
+        # Link posts append the linked URL; the title is often repeated
+        content = _REDDIT_LINK_RE.sub("", content)
+    content = clean_text(content)
+    title = clean_text(item["title"])
+    if item["source"] != "twitter" and content.startswith(title):
+        content = content[len(title):].lstrip(" :-–—")
+    return content
+
+
+def compact_item(item: dict, max_chars: int) -> dict:
+    """Compact form of one serialized FeedItem, its text cut to ``max_chars``."""
+    compact: dict = {}
+    if item["source"] != "twitter":
+        compact["t"] = clean_text(item["title"])
+
+    body = truncate(_body(item), max_chars)
+    if body:
+        compact["c"] = body
+
+    if item.get("url"):
+        compact["u"] = item["url"]
+    compact["s"] = item["source"]
+    compact["n"] = item["source_name"]
+    author = item.get("author")
+    if author and author not in item["source_name"]:
+        compact["a"] = author
+    compact["p"] = item["published_at"]
+    if item.get("engagement"):
+        compact["e"] = item["engagement"]
+
+    related = item.get("related")
+    if related:
+        compact["r"] = [
+            {"s": r["source"], "n": r["source_name"], "u": r.get("url")}
+            for r in related
+        ]
+    return compact
+
+
+def compact_topic(items: list[dict], item_chars: int, topic_chars: int) -> list[dict]:
+    """Compact a topic's items, sharing ``topic_chars`` of text between them.
+
+    Items are taken in order, each with at most ``item_chars`` of text. Once
+    the topic budget is spent, the remaining items keep only their headline
+    (X posts, which have none, are dropped).
+    """
+    compacted: list[dict] = []
+    remaining = topic_chars
+    for item in items:
+        compact = compact_item(item, min(item_chars, remaining))
+        remaining -= len(compact.get("c", ""))
+        if "t" in compact or "c" in compact:
+            compacted.append(compact)
+    return compacted
@@ -0,0 +1,26 @@
+"""JSON responses encoded with orjson.
+
+FastAPI runs returned values through ``jsonable_encoder`` and then
+``json.dumps``; for a collect response of a few dozen items that walk
+dominates the request's CPU time. Routes that return an ``ORJSONResponse``
+directly skip both, and ``RawJSONResponse`` sends already-encoded JSON
+(e.g. from the cache) as is.
+"""
+
+from typing import Any
+
+import orjson
+from starlette.responses import JSONResponse, Response
+
+
+class ORJSONResponse(JSONResponse):
+    """A JSON response rendered by orjson (datetimes and enums are native)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+class RawJSONResponse(Response):
+    """A response whose body is already-encoded JSON, sent without re-encoding."""
+
+    media_type = "application/json"
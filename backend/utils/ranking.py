@@ -0,0 +1,123 @@
+"""Rank collected items across sources.
+
+Raw engagement is not comparable between sources: a Reddit score in the
+thousands is common, an X post with a hundred likes is not, and RSS has no
+engagement signal at all. Each source's engagement is log-scaled and turned
+into a percentile over a window of recently seen items of that source, then
+combined with recency decay and topic relevance into one score. The top K
+items per topic are selected with a heap.
+"""
+
+import heapq
+import math
+from bisect import bisect_right, insort
+from collections import deque
+from datetime import datetime, timezone
+from typing import Iterable
+
+from config import settings
+from models.feed_item import FeedItem, NewsSource
+from utils.topic_matcher import TopicMatcher, get_matcher
+
+# Sources whose items carry no engagement count; they get a neutral score
+UNSCORED_SOURCES = frozenset({NewsSource.RSS})
+NEUTRAL_ENGAGEMENT = 0.5
+
+# Until a source's window holds this many items, engagement is scaled
+# against a fixed reference instead of percentiles
+MIN_WINDOW_SAMPLES = 20
+REFERENCE_ENGAGEMENT = {
+    NewsSource.REDDIT: 5000,
+    NewsSource.TWITTER: 1000,
+}
+
+
+class EngagementStats:
+    """Per-source windows of log-scaled engagement, for percentile lookups."""
+
+    def __init__(self, window_size: int = 1000):
+        self.window_size = window_size
+        self._recent: dict[NewsSource, deque[float]] = {}
+        self._sorted: dict[NewsSource, list[float]] = {}
+
+    def observe(self, items: Iterable[FeedItem]):
+        """Add items' engagement to their source's window."""
+        for item in items:
+            if item.source in UNSCORED_SOURCES:
+                continue
+            recent = self._recent.setdefault(item.source, deque())
+            ordered = self._sorted.setdefault(item.source, [])
+            value = math.log1p(max(0, item.engagement))
+            if len(recent) >= self.window_size:
+                oldest = recent.popleft()
+                del ordered[bisect_right(ordered, oldest) - 1]
+            recent.append(value)
+            insort(ordered, value)
+
+    def normalize(self, source: NewsSource, engagement: int) -> float:
+        """Engagement as a 0.0-1.0 score relative to the source's recent items."""
+        if source in UNSCORED_SOURCES:
+            return NEUTRAL_ENGAGEMENT
+        value = math.log1p(max(0, engagement))
+        ordered = self._sorted.get(source, [])
+        if len(ordered) < MIN_WINDOW_SAMPLES:
+            reference = math.log1p(REFERENCE_ENGAGEMENT.get(source, 1000))
+            return min(1.0, value / reference)
+        return bisect_right(ordered, value) / len(ordered)
+
+
+class Ranker:
+    """Score items by relevance, normalized engagement and recency.
+
+    ``score = relevance_weight * relevance + engagement_weight * engagement
+    + recency_weight * 0.5 ** (age / half_life)``, each term in 0.0-1.0.
+    Subclass and override ``score`` to plug in a different ranking.
+    """
+
+    def __init__(
+        self,
+        stats: EngagementStats,
+        relevance_weight: float = 0.4,
+        engagement_weight: float = 0.3,
+        recency_weight: float = 0.3,
+        half_life_hours: float = 12.0,
+    ):
+        self.stats = stats
+        self.relevance_weight = relevance_weight
+        self.engagement_weight = engagement_weight
+        self.recency_weight = recency_weight
+        self.half_life_seconds = half_life_hours * 3600
+
+    def score(self, item: FeedItem, matcher: TopicMatcher, now: datetime) -> float:
+        relevance = matcher.match(f"{item.title} {item.content}").score
+        engagement = self.stats.normalize(item.source, item.engagement)
+
+        published = item.published_at
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)
+        age = max(0.0, (now - published).total_seconds())
+        recency = 0.5 ** (age / self.half_life_seconds)
+
+        return (
+            self.relevance_weight * relevance
+            + self.engagement_weight * engagement
+            + self.recency_weight * recency
+        )
+
+    def top_k(self, items: Iterable[FeedItem], topic: str, k: int) -> list[FeedItem]:
+        """The ``k`` best items for a topic, best first."""
+        matcher = get_matcher(topic)
+        now = datetime.now(timezone.utc)
+        return heapq.nlargest(k, items, key=lambda item: self.score(item, matcher, now))
+
+
+# Process-wide engagement windows, fed by live fetches and ingestion
+engagement_stats = EngagementStats(settings.rank_window_size)
+
+ranker = Ranker(
+    engagement_stats,
+    relevance_weight=settings.rank_relevance_weight,
+    engagement_weight=settings.rank_engagement_weight,
+    recency_weight=settings.rank_recency_weight,
+    half_life_hours=settings.rank_half_life_hours,
+)
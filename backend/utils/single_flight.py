@@ -0,0 +1,53 @@
+"""In-process request coalescing.
+
+Concurrent callers asking for the same key share a single execution of the
+work instead of each starting their own.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; later callers await its result."""
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._inflight
+
+    def _task(self, key: str, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return ``fn()``'s result, sharing one execution among concurrent callers.
+
+        The work runs in its own task, so a caller going away (e.g. a client
+        disconnect) does not cancel it for the others.
+        """
+        return await asyncio.shield(self._task(key, fn))
+
+    def spawn(self, key: str, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start ``fn()`` in the background unless a call for ``key`` is in flight.
+
+        Failures are logged rather than raised, as nobody awaits the result.
+        """
+        if key in self._inflight:
+            return self._inflight[key]
+        task = self._task(key, fn)
+        task.add_done_callback(_log_failure)
+        return task
+
+
+def _log_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background call failed: %s", task.exception())
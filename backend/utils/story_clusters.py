@@ -0,0 +1,186 @@
+"""Cross-source deduplication and story clustering.
+
+The same story often shows up as a news article, a Reddit link post to that
+article and a handful of posts on X. Items are grouped into stories when:
+
+- their canonical URLs are equal (tracking parameters, ``www.``, trailing
+  slashes etc. removed), or a Reddit link post points at another item's URL;
+- their titles are near-duplicates, found with MinHash signatures and
+  banded LSH, then confirmed by exact Jaccard similarity of word sets.
+
+Each story is emitted once, as its best item with the others attached as
+``related`` sources.
+"""
+
+import random
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from models.feed_item import FeedItem, NewsSource, RelatedSource
+
+# Query parameters that only track the click, not the content
+_TRACKING_PARAM_RE = re.compile(
+    r"^(utm_\w+|at_\w+|fbclid|gclid|igshid|mc_cid|mc_eid|ref|ref_src|cmpid|ocid|smid)$",
+    re.IGNORECASE,
+)
+_HOST_ALIASES = {"twitter.com": "x.com", "old.reddit.com": "reddit.com"}
+_REDDIT_LINK_RE = re.compile(r"\n\nLink: (\S+)$")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or says "
+    "that the this to was were will with after over new".split()
+)
+
+# Titles need this many content words to be compared at all
+MIN_TITLE_WORDS = 3
+# Jaccard similarity of title words above which two items are one story
+TITLE_SIMILARITY_THRESHOLD = 0.5
+
+# MinHash / LSH parameters: 16 bands of 2 rows catch pairs at Jaccard 0.5
+# with ~99% probability
+NUM_PERMUTATIONS = 32
+BAND_ROWS = 2
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+# Which item represents a story, lowest first
+_SOURCE_PRIORITY = {NewsSource.RSS: 0, NewsSource.REDDIT: 1, NewsSource.TWITTER: 2}
+
+
+def canonicalize_url(url: str | None) -> str | None:
+    """Normalize a URL so that links to the same page compare equal."""
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return None
+    if not parts.netloc:
+        return None
+
+    host = parts.hostname or ""
+    for prefix in ("www.", "m.", "mobile."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    host = _HOST_ALIASES.get(host, host)
+
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAM_RE.match(k)
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def _linked_url(item: FeedItem) -> str | None:
+    """The external URL a Reddit link post points to, if any."""
+    if item.source != NewsSource.REDDIT:
+        return None
+    match = _REDDIT_LINK_RE.search(item.content)
+    return canonicalize_url(match.group(1)) if match else None
+
+
+def _title_words(item: FeedItem) -> frozenset[str]:
+    """Content words of the item's headline (the post text for X)."""
+    text = item.content[:280] if item.source == NewsSource.TWITTER else item.title
+    return frozenset(w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS)
+
+
+def _minhash(words: frozenset[str]) -> tuple[int, ...]:
+    hashes = [zlib.crc32(w.encode()) for w in words]
+    return tuple(
+        min((a * h + b) % _PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        self.parent[self.find(i)] = self.find(j)
+
+
+def cluster_stories(items: list[FeedItem]) -> list[FeedItem]:
+    """Collapse items covering the same story into one item each.
+
+    Returns one item per story, in the order the stories first appear. The
+    representative is the first RSS item, else Reddit, else X (ties broken
+    by engagement); the rest are listed in its ``related`` sources.
+    """
+    if len(items) < 2:
+        return items
+
+    groups = _UnionFind(len(items))
+
+    # Same canonical URL, or a Reddit post linking to it
+    by_url: dict[str, int] = {}
+    for i, item in enumerate(items):
+        for url in (canonicalize_url(item.url), _linked_url(item)):
+            if url is None:
+                continue
+            if url in by_url:
+                groups.union(i, by_url[url])
+            else:
+                by_url[url] = i
+
+    # Near-duplicate titles: LSH buckets give candidates, Jaccard confirms
+    words = [_title_words(item) for item in items]
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    for i, item_words in enumerate(words):
+        if len(item_words) < MIN_TITLE_WORDS:
+            continue
+        signature = _minhash(item_words)
+        for band in range(0, NUM_PERMUTATIONS, BAND_ROWS):
+            buckets.setdefault((band, signature[band:band + BAND_ROWS]), []).append(i)
+
+    compared: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for a, i in enumerate(members):
+            for j in members[a + 1:]:
+                if (i, j) in compared or groups.find(i) == groups.find(j):
+                    continue
+                compared.add((i, j))
+                similarity = len(words[i] & words[j]) / len(words[i] | words[j])
+                if similarity >= TITLE_SIMILARITY_THRESHOLD:
+                    groups.union(i, j)
+
+    clusters: dict[int, list[int]] = {}
+    for i in range(len(items)):
+        clusters.setdefault(groups.find(i), []).append(i)
+
+    stories: list[FeedItem] = []
+    for members in sorted(clusters.values(), key=lambda m: m[0]):
+        if len(members) == 1:
+            stories.append(items[members[0]])
+            continue
+        ranked = sorted(
+            members,
+            key=lambda i: (_SOURCE_PRIORITY[items[i].source], -items[i].engagement),
+        )
+        lead = items[ranked[0]]
+        related = list(lead.related) + [
+            RelatedSource(
+                source=items[i].source,
+                source_name=items[i].source_name,
+                url=items[i].url,
+            )
+            for i in ranked[1:]
+        ]
+        stories.append(lead.model_copy(update={"related": related}))
+
+    return stories
@@ -0,0 +1,126 @@
+"""Inverted keyword index for matching topics against ingested items.
+
+Each item is tokenized once when it is added. Queries look up the postings
+of the words the topic's expanded keywords start with, then score those
+candidates with the topic's ``TopicMatcher``. Cost grows with the number of
+candidates rather than with the number of indexed items.
+
+Keywords are looked up by prefix ("election" finds "elections", "bitcoin"
+finds "bitcoins"), so results and scores are those of ``match_topic`` for
+every text in which a keyword starts a word. Texts that contain a keyword
+only in the middle of a word ("ai" in "said") are not found.
+"""
+
+import bisect
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+from utils.topic_matcher import MatchResult, _get_topic_keywords, _normalize, get_matcher
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of the text."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=1024)
+def keyword_prefixes(topic: str, skip: frozenset[str] = frozenset()) -> tuple[str, ...]:
+    """Word prefixes whose postings hold every candidate text for the topic.
+
+    A single-word keyword is its own prefix. In a multi-word keyword every
+    word after the first starts a word of the text wherever the keyword
+    occurs, so the longest of them is used. Words in ``skip`` (unindexed
+    stopwords) are never used; keywords made only of them are dropped.
+    """
+    prefixes: set[str] = set()
+    for keyword in _get_topic_keywords(topic):
+        tokens = tokenize(keyword)
+        usable = [t for t in (tokens[1:] or tokens) if t not in skip]
+        if not usable and len(tokens) > 1 and tokens[0] not in skip:
+            usable = tokens[:1]
+        if usable:
+            prefixes.add(max(usable, key=len))
+    return tuple(sorted(prefixes))
+
+
+class TopicIndex:
+    """Word -> item-id postings over ingested items."""
+
+    def __init__(self):
+        self._postings: dict[str, set[str]] = defaultdict(set)
+        # Sorted distinct words, for prefix lookups
+        self._vocabulary: list[str] = []
+        # Per item: indexed words (for removal), normalized text (for the
+        # matcher) and publish time
+        self._words: dict[str, set[str]] = {}
+        self._texts: dict[str, str] = {}
+        self._published: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._words
+
+    def add(self, item_id: str, text: str, published: float):
+        """Tokenize and index an item, replacing any previous version."""
+        if item_id in self._words:
+            self.remove(item_id)
+
+        words = set(tokenize(text))
+        for word in words:
+            postings = self._postings[word]
+            if not postings:
+                bisect.insort(self._vocabulary, word)
+            postings.add(item_id)
+        self._words[item_id] = words
+        self._texts[item_id] = _normalize(text)
+        self._published[item_id] = published
+
+    def remove(self, item_id: str):
+        """Drop an item from the index."""
+        words = self._words.pop(item_id, None)
+        if words is None:
+            return
+        for word in words:
+            postings = self._postings.get(word)
+            if postings is not None:
+                postings.discard(item_id)
+                if not postings:
+                    del self._postings[word]
+                    pos = bisect.bisect_left(self._vocabulary, word)
+                    del self._vocabulary[pos]
+        del self._texts[item_id]
+        del self._published[item_id]
+
+    def _lookup(self, prefix: str) -> set[str]:
+        """Items with a word starting with ``prefix``."""
+        found: set[str] = set()
+        pos = bisect.bisect_left(self._vocabulary, prefix)
+        while pos < len(self._vocabulary) and self._vocabulary[pos].startswith(prefix):
+            found |= self._postings[self._vocabulary[pos]]
+            pos += 1
+        return found
+
+    def match(self, topic: str, since: float | None = None) -> dict[str, MatchResult]:
+        """Items matching the topic, published at or after ``since``.
+
+        Returns:
+            Map of item id to its MatchResult.
+        """
+        candidates: set[str] = set()
+        for prefix in keyword_prefixes(topic):
+            candidates |= self._lookup(prefix)
+
+        matcher = get_matcher(topic)
+        results: dict[str, MatchResult] = {}
+        for item_id in candidates:
+            if since is not None and self._published[item_id] < since:
+                continue
+            result = matcher.match_normalized(self._texts[item_id])
+            if result.matched:
+                results[item_id] = result
+        return results
@@ -6,6 +6,7 @@ Supports multi-word topics and basic relevance scoring.
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass
@@ -29,9 +30,12 @@ TOPIC_EXPANSIONS: dict[str, list[str]] = {
 }
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
 def _normalize(text: str) -> str:
     """Lowercase and remove extra whitespace."""
-    return re.sub(r"\s+", " ", text.lower().strip())
+    return _WHITESPACE_RE.sub(" ", text.lower().strip())
 
 
 def _get_topic_keywords(topic: str) -> list[str]:
@@ -50,6 +54,62 @@ def _get_topic_keywords(topic: str) -> list[str]:
     return list(set(keywords))
 
 
+class TopicMatcher:
+    """Keyword matcher for one topic, built once and reused across texts.
+
+    Keywords are checked shortest first. When a keyword is absent, every
+    longer keyword containing it ("gpt" -> "chatgpt", "climate" ->
+    "climate change") is known to be absent too and is skipped.
+    """
+
+    def __init__(self, topic: str):
+        self.topic = _normalize(topic)
+        self.keywords: tuple[str, ...] = tuple(
+            sorted(_get_topic_keywords(topic), key=lambda k: (len(k), k))
+        )
+        # Bitmask of longer keywords that contain each keyword
+        self._checks: tuple[tuple[int, str, int], ...] = tuple(
+            (
+                1 << i,
+                keyword,
+                sum(
+                    1 << j for j, other in enumerate(self.keywords)
+                    if j > i and keyword in other
+                ),
+            )
+            for i, keyword in enumerate(self.keywords)
+        )
+
+    def match(self, text: str) -> MatchResult:
+        """Match raw text against the topic."""
+        return self.match_normalized(_normalize(text))
+
+    def match_normalized(self, normalized_text: str) -> MatchResult:
+        """Match text that has already been through ``_normalize``."""
+        if not normalized_text:
+            return MatchResult(matched=False, score=0.0)
+
+        match_count = 0
+        skipped = 0
+        for bit, keyword, superstrings in self._checks:
+            if skipped & bit:
+                continue
+            if keyword in normalized_text:
+                match_count += 1
+            else:
+                skipped |= superstrings
+
+        return score_matches(
+            match_count, len(self.keywords), self.topic in normalized_text[:100]
+        )
+
+
+@lru_cache(maxsize=256)
+def get_matcher(topic: str) -> TopicMatcher:
+    """Get the compiled matcher for a topic (LRU-cached)."""
+    return TopicMatcher(topic)
+
+
 def match_topic(text: str, topic: str) -> MatchResult:
     """Check if text is relevant to the given topic.
 
@@ -62,20 +122,41 @@ def match_topic(text: str, topic: str) -> MatchResult:
     Returns:
         MatchResult with matched=True if relevant and a relevance score.
     """
-    normalized_text = _normalize(text)
-    keywords = _get_topic_keywords(topic)
+    return get_matcher(topic).match(text)
 
-    if not normalized_text:
-        return MatchResult(matched=False, score=0.0)
 
-    # Count keyword matches
-    match_count = 0
-    total_keywords = len(keywords)
+def match_many(texts: list[str], topics: list[str]) -> list[dict[str, MatchResult]]:
+    """Score every text against every topic, normalizing each text once.
+
+    Args:
+        texts: Text contents to check.
+        topics: Topics of interest.
+
+    Returns:
+        One ``{topic: MatchResult}`` dict per text, in input order.
+    """
+    matchers = [(topic, get_matcher(topic)) for topic in topics]
+    results = []
+    for text in texts:
+        normalized_text = _normalize(text)
+        results.append({
+            topic: matcher.match_normalized(normalized_text)
+            for topic, matcher in matchers
+        })
+    return results
+
 
-    for keyword in keywords:
-        if keyword in normalized_text:
-            match_count += 1
+def score_matches(match_count: int, total_keywords: int, in_title: bool) -> MatchResult:
+    """Score a text from how many topic keywords it contains.
 
+    Args:
+        match_count: Number of the topic's keywords found in the text.
+        total_keywords: Number of keywords the topic expands to.
+        in_title: Whether the exact topic appears in the first 100 chars.
+
+    Returns:
+        MatchResult with the relevance score.
+    """
     if match_count == 0:
         return MatchResult(matched=False, score=0.0)
 
@@ -83,7 +164,7 @@ def match_topic(text: str, topic: str) -> MatchResult:
     score = min(1.0, match_count / max(1, total_keywords / 2))
 
     # Boost score if exact topic appears in title position (first 100 chars)
-    if _normalize(topic) in normalized_text[:100]:
+    if in_title:
         score = min(1.0, score + 0.3)
 
     return MatchResult(matched=True, score=round(score, 2))
@@ -107,10 +188,11 @@ def filter_by_topic(
         Filtered list sorted by relevance score (highest first).
     """
     scored: list[tuple[float, dict]] = []
+    matcher = get_matcher(topic)
 
     for item in items:
         combined_text = " ".join(str(item.get(f, "")) for f in text_fields)
-        result = match_topic(combined_text, topic)
+        result = matcher.match(combined_text)
         if result.matched and result.score >= min_score:
             scored.append((result.score, item))
 
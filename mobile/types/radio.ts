@@ -6,6 +6,12 @@ export type RadioState =
   | "briefing"
   | "error";
 
+export interface RelatedSource {
+  source: "twitter" | "rss" | "reddit";
+  source_name: string;
+  url: string | null;
+}
+
 export interface FeedItem {
   title: string;
   content: string;
@@ -15,6 +21,7 @@ export interface FeedItem {
   author: string | null;
   published_at: string;
   engagement: number;
+  related?: RelatedSource[];
 }
 
 export interface TopicData {